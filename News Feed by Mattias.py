@@ -1,7 +1,37 @@
 # File: News Feed by Mattias.py
 # Main entry point for the application
 
-import widgets
+import time
+STARTED = time.perf_counter()
+
+import argparse
 
 if __name__ == "__main__":
-    widgets.setup_gui()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="News Feed by Mattias")
+    parser.add_argument("--serve", action="store_true", help="serve the saved lists as a local HTTP/JSON API instead of opening the window")
+    parser.add_argument("--host", help="address to bind in --serve mode")
+    parser.add_argument("--port", type=int, help="port to bind in --serve mode")
+    parser.add_argument("--perf", action="store_true", help="record timings from startup (see Help → Performance)")
+    parser.add_argument("--trace", metavar="FILE", help="write every timing span to FILE as JSON lines")
+    parser.add_argument("--startup-timing", action="store_true", help="print the time from launch to window, first paint and first articles")
+    args = parser.parse_args()
+
+    if args.startup_timing:
+        import config
+        config.STARTUP_STARTED = STARTED
+
+    if args.perf or args.trace:
+        import config
+        import perf
+        config.PERF_ENABLED = True
+        if args.trace:
+            perf.start_trace(args.trace)
+
+    if args.serve:
+        import server
+        server.run(args.host, args.port)
+    else:
+        import perf
+        import widgets
+        perf.startup_mark("imports")
+        widgets.setup_gui()
\ No newline at end of file
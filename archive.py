@@ -0,0 +1,296 @@
+import re
+import sqlite3
+import threading
+import time
+
+import config
+import rss
+
+_WRITE_LOCK = threading.Lock()
+
+URL_PREFIX = "history:"
+SEARCH_PREFIX = "search:"
+
+# Set once the schema (and the full-text index, if SQLite has FTS5) exists
+_SCHEMA_READY = False
+_FTS_AVAILABLE = False
+
+# Append-only: unlike the article store this is never evicted or rebuilt
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    source_url TEXT NOT NULL,
+    story_key TEXT NOT NULL,
+    title TEXT,
+    link TEXT,
+    guid TEXT,
+    summary TEXT,
+    published REAL NOT NULL,
+    source_domain TEXT,
+    archived_at REAL NOT NULL,
+    UNIQUE (source_url, story_key)
+);
+CREATE INDEX IF NOT EXISTS history_source_published ON history (source_url, published);
+CREATE INDEX IF NOT EXISTS history_published ON history (published);
+"""
+
+# Full-text index over title and summary, kept in step with history by a trigger
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE history_fts USING fts5(
+    title, summary, content='history', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+);
+CREATE TRIGGER history_fts_insert AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+"""
+
+_COLUMNS = "title, link, guid, summary, published, source_url, source_domain"
+
+def _connect():
+    """Open a connection to the history archive, creating the schema if needed."""
+    global _SCHEMA_READY, _FTS_AVAILABLE
+    conn = sqlite3.connect(config.ARCHIVE_FILE, timeout=5)
+    if _SCHEMA_READY:
+        return conn
+
+    with _WRITE_LOCK:
+        # WAL lets the GUI page through history while a refresh appends to it
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'history_fts'").fetchone():
+            _FTS_AVAILABLE = True
+        else:
+            try:
+                with conn:
+                    conn.executescript(_FTS_SCHEMA)
+                    # Index what an older archive already holds
+                    conn.execute("INSERT INTO history_fts (history_fts) VALUES ('rebuild')")
+                _FTS_AVAILABLE = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5: search falls back to LIKE
+                _FTS_AVAILABLE = False
+        _SCHEMA_READY = True
+    return conn
+
+def append(entries):
+    """
+    Archive every entry not seen before (per source, by rss.entry_key).
+    Safe to call from background threads. Returns the number of new rows,
+    or None if the archive could not be written.
+    """
+    now = time.time()
+    rows = [
+        (
+            entry.source_url or "",
+            rss.entry_key(entry) or "",
+            entry.title,
+            entry.link,
+            entry.guid,
+            entry.summary,
+            entry.published,
+            entry.source_domain,
+            now,
+        )
+        for entry in entries
+    ]
+
+    try:
+        conn = _connect()
+        with _WRITE_LOCK:
+            try:
+                with conn:
+                    cursor = conn.executemany(
+                        "INSERT OR IGNORE INTO history "
+                        "(source_url, story_key, title, link, guid, summary, published, source_domain, archived_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows
+                    )
+                    return cursor.rowcount
+            finally:
+                conn.close()
+    except sqlite3.Error:
+        return None
+
+def _where(source_urls, start, end):
+    clauses = []
+    params = []
+    if source_urls:
+        clauses.append(f"source_url IN ({', '.join('?' * len(source_urls))})")
+        params.extend(source_urls)
+    if start is not None:
+        clauses.append("published >= ?")
+        params.append(start)
+    if end is not None:
+        clauses.append("published < ?")
+        params.append(end)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+def count(source_urls=None, start=None, end=None):
+    """Number of archived entries from source_urls (all if None) published in [start, end)."""
+    where, params = _where(source_urls, start, end)
+    try:
+        conn = _connect()
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM history{where}", params).fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return 0
+
+def query(source_urls=None, start=None, end=None, limit=100, offset=0):
+    """
+    Archived entries from source_urls (all if None) published in
+    [start, end), newest first, as Article records.
+    """
+    where, params = _where(source_urls, start, end)
+    try:
+        conn = _connect()
+        try:
+            rows = conn.execute(
+                f"SELECT {_COLUMNS} FROM history{where} ORDER BY published DESC, id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return []
+    return [rss.Article(*row) for row in rows]
+
+class History:
+    """
+    Read-only view of an archive range that behaves like a list of Articles
+    (len, indexing, slicing). Each slice is one indexed query, so paging
+    never loads more than a page into memory.
+    """
+
+    def __init__(self, source_urls=None, start=None, end=None):
+        self.source_urls = list(source_urls) if source_urls else None
+        self.start = start
+        self.end = end
+        self._count = count(self.source_urls, start, end)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            first, last, step = key.indices(self._count)
+            if first >= last:
+                return []
+            entries = query(self.source_urls, self.start, self.end, last - first, first)
+            return entries[::step]
+        if key < 0:
+            key += self._count
+        if not 0 <= key < self._count:
+            raise IndexError("history index out of range")
+        return query(self.source_urls, self.start, self.end, 1, key)[0]
+
+_QUERY_TOKEN = re.compile(r'"([^"]*)"|(\S+)')
+
+def query_terms(text):
+    """
+    Split a search into terms: "quoted phrases" stay whole and a trailing *
+    marks a prefix. Returns [(term, is_prefix)].
+    """
+    terms = []
+    for phrase, word in _QUERY_TOKEN.findall(text):
+        if phrase.strip():
+            terms.append((phrase.strip(), False))
+        elif word:
+            is_prefix = word.endswith("*")
+            word = word.strip('"*')
+            if word:
+                terms.append((word, is_prefix))
+    return terms
+
+def _fts_query(terms):
+    # Every term is quoted so user input can never be read as FTS5 syntax
+    parts = []
+    for term, is_prefix in terms:
+        quoted = '"' + term.replace('"', '""') + '"'
+        parts.append(quoted + "*" if is_prefix else quoted)
+    return " ".join(parts)
+
+def _like_where(terms):
+    clauses = []
+    params = []
+    for term, _ in terms:
+        clauses.append("(title LIKE ? ESCAPE '\\' OR summary LIKE ? ESCAPE '\\')")
+        pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        params.extend([pattern, pattern])
+    return " WHERE " + " AND ".join(clauses), params
+
+def search_ids(text):
+    """
+    Row ids of the archived entries matching every term of text, best
+    match first (BM25, title hits weighted above summary hits), at most
+    config.SEARCH_MAX_RESULTS. Only the newest config.SEARCH_RANK_CANDIDATES
+    matches are ranked, which bounds the cost of very common terms.
+    Without FTS5 the matches come newest first instead.
+    """
+    terms = query_terms(text)
+    if not terms:
+        return []
+    try:
+        conn = _connect()
+        try:
+            if _FTS_AVAILABLE:
+                query = _fts_query(terms)
+                oldest = conn.execute(
+                    "SELECT rowid FROM history_fts WHERE history_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+                    (query, config.SEARCH_RANK_CANDIDATES)
+                ).fetchone()
+                rows = conn.execute(
+                    "SELECT rowid FROM history_fts WHERE history_fts MATCH ? AND rowid >= ? "
+                    "ORDER BY bm25(history_fts, 3.0, 1.0), rowid DESC LIMIT ?",
+                    (query, oldest[0] if oldest else 0, config.SEARCH_MAX_RESULTS)
+                ).fetchall()
+            else:
+                where, params = _like_where(terms)
+                rows = conn.execute(
+                    f"SELECT id FROM history{where} ORDER BY published DESC LIMIT ?",
+                    params + [config.SEARCH_MAX_RESULTS]
+                ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return []
+    return [row[0] for row in rows]
+
+def load(ids):
+    """The archived entries with the given row ids, in the same order, as Article records."""
+    if not ids:
+        return []
+    try:
+        conn = _connect()
+        try:
+            rows = conn.execute(
+                f"SELECT id, {_COLUMNS} FROM history WHERE id IN ({', '.join('?' * len(ids))})",
+                list(ids)
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return []
+    by_id = {row[0]: rss.Article(*row[1:]) for row in rows}
+    return [by_id[row_id] for row_id in ids if row_id in by_id]
+
+class SearchResults:
+    """
+    Ranked full-text matches of text across the archive, as a lazy list of
+    Articles. The ranking runs once; each page loads only its own rows.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.terms = [term for term, _ in query_terms(text)]
+        self._ids = search_ids(text)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return load(self._ids[key])
+        return load([self._ids[key]])[0]
\ No newline at end of file
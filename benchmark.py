@@ -0,0 +1,362 @@
+# File: benchmark.py
+# Benchmarks for the fetch, parse, sort, merge, index, search and render paths
+
+import argparse
+import http.server
+import itertools
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from email.utils import formatdate
+
+import feedparser
+
+import config
+import engine
+import rss
+import streamparse
+
+DEFAULT_SIZES = (10, 100, 10000)
+DEFAULT_REPEAT = 20
+REGRESSION_THRESHOLD = 0.20  # p50 slowdown reported as a regression
+
+_WORDS = (
+    "market election storm climate energy football council research health "
+    "budget court police school transport housing science music film travel"
+).split()
+
+def make_fixture(entry_count, seed=0):
+    """A deterministic RSS 2.0 document with entry_count items, newest first."""
+    rng = random.Random(seed + entry_count)
+    newest = 1700000000
+    items = []
+    for i in range(entry_count):
+        title = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(5, 10))).capitalize()
+        summary = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(20, 60)))
+        items.append(
+            "<item>"
+            f"<title>{title} {i}</title>"
+            f"<link>https://news.example.com/{entry_count}/{i}?utm_source=rss</link>"
+            f"<guid>fixture-{entry_count}-{i}</guid>"
+            f"<description>&lt;p&gt;{summary}&lt;/p&gt;</description>"
+            f"<pubDate>{formatdate(newest - i * 60 - rng.randint(0, 59))}</pubDate>"
+            "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        f"<title>Fixture {entry_count}</title><link>https://news.example.com/</link>"
+        + "".join(items) +
+        "</channel></rss>"
+    ).encode("utf-8")
+
+def load_fixtures(sizes, fixture_dir=None):
+    """
+    Fixture bodies by name. Recorded feeds in fixture_dir (*.xml) are used
+    as-is; otherwise synthetic feeds of each size are generated.
+    """
+    fixtures = {}
+    if fixture_dir:
+        for name in sorted(os.listdir(fixture_dir)):
+            if name.endswith(".xml"):
+                with open(os.path.join(fixture_dir, name), "rb") as f:
+                    fixtures[name[:-4]] = f.read()
+    else:
+        for size in sizes:
+            fixtures[f"feed-{size}"] = make_fixture(size)
+    return fixtures
+
+def start_fixture_server(fixtures):
+    """Serve fixtures at /<name>.xml from a local thread; returns (server, base_url)."""
+    class FixtureHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            body = fixtures.get(self.path.lstrip("/").removesuffix(".xml"))
+            if body is None:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def measure(func, repeat, items):
+    """
+    Time func() repeat times after one warm-up call, then once more under
+    tracemalloc for the peak Python allocation. items is the number of
+    entries one call processes (for throughput).
+    """
+    func()
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    timings.sort()
+    mean = statistics.fmean(timings)
+    return {
+        "p50_ms": percentile(timings, 0.50) * 1000,
+        "p90_ms": percentile(timings, 0.90) * 1000,
+        "p99_ms": percentile(timings, 0.99) * 1000,
+        "ops_per_s": 1 / mean if mean else 0.0,
+        "entries_per_s": items / mean if mean else 0.0,
+        "peak_kib": peak / 1024,
+    }
+
+# -- Stages -------------------------------------------------------------------
+
+def bench_fetch(name, body, base_url, repeat):
+    url = f"{base_url}/{name}.xml"
+    items = min(len(feedparser.parse(body).entries), config.MAX_ENTRIES_PER_FEED)
+    return measure(lambda: rss.fetch_feed_entries(url, config.MAX_ENTRIES_PER_FEED), repeat, items)
+
+def bench_parse(name, body, base_url, repeat):
+    """The streaming parser, reading the whole document (no early cutoff)."""
+    count = len(feedparser.parse(body).entries)
+    return measure(lambda: streamparse.parse_entries(body, count), repeat, count)
+
+def bench_parse_feedparser(name, body, base_url, repeat):
+    """feedparser on the same document, for comparison with the streaming parser."""
+    count = len(feedparser.parse(body).entries)
+    return measure(lambda: feedparser.parse(body), repeat, count)
+
+def bench_sort(name, body, base_url, repeat):
+    """Build Article records and sort them newest first, as fetch_source_entries does."""
+    raw_entries = feedparser.parse(body).entries
+
+    def run():
+        entries = [rss.Article.from_entry(entry, name, name) for entry in raw_entries]
+        entries.sort(key=lambda article: article.published, reverse=True)
+        return entries
+    return measure(run, repeat, len(raw_entries))
+
+def make_sources(articles, source_count=4, duplicate_every=10):
+    """
+    Split articles round-robin into source_count sources (each newest
+    first). Every duplicate_every-th article is also carried by the next
+    source under its own GUID and link, for dedup to find by title.
+    """
+    sources = [[] for _ in range(source_count)]
+    for i, article in enumerate(articles):
+        source = i % source_count
+        sources[source].append(rss.Article(
+            article.title, article.link, article.guid, article.summary, article.published,
+            f"source-{source}", f"source-{source}"
+        ))
+        if i % duplicate_every == 0:
+            other = (source + 1) % source_count
+            sources[other].append(rss.Article(
+                article.title, f"{article.link}&copy={other}", f"{article.guid}-copy", article.summary,
+                article.published, f"source-{other}", f"source-{other}"
+            ))
+    return sources
+
+def bench_merge(name, body, base_url, repeat):
+    """k-way merge with duplicate removal over several sources, as fetch_feed_entries does."""
+    articles = [rss.Article.from_entry(entry) for entry in feedparser.parse(body).entries]
+    articles.sort(key=lambda article: article.published, reverse=True)
+    sources = make_sources(articles)
+    total = sum(len(entries) for entries in sources)
+    return measure(lambda: rss.merge_sources(sources, total), repeat, total)
+
+def bench_index(name, body, base_url, repeat):
+    articles = [rss.Article.from_entry(entry) for entry in feedparser.parse(body).entries]
+    feed_engine = engine.FeedEngine(persist=False, max_entries=len(articles))
+
+    def run():
+        feed_engine.remove_feed(name)
+        feed_engine.set_articles(name, articles)
+    return measure(run, repeat, len(articles))
+
+def bench_search(name, body, base_url, repeat):
+    articles = [rss.Article.from_entry(entry) for entry in feedparser.parse(body).entries]
+    feed_engine = engine.FeedEngine(persist=False, max_entries=len(articles))
+    feed_engine.set_articles(name, articles)
+    # Alternate terms so the index's last-result cache never answers
+    terms = itertools.cycle(_WORDS)
+    return measure(lambda: feed_engine.query(next(terms)), repeat, len(articles))
+
+class TkBench:
+    """A themed window holding an article container, as setup_gui builds it."""
+
+    def __init__(self):
+        import tkinter as tk
+        import themes
+        import widgets
+
+        self.widgets = widgets
+        self.root = tk.Tk()
+        self.root.geometry("900x700")
+        themes.configure_ttk_theme(config.CURRENT_THEME)
+        canvas = tk.Canvas(self.root)
+        canvas.pack(fill="both", expand=True)
+        self.container = tk.Frame(canvas)
+        canvas.create_window((0, 0), window=self.container, anchor="nw")
+        self.text = tk.Text(self.root, wrap="word")
+
+    def close(self):
+        self.root.destroy()
+
+def bench_render(tk_bench):
+    def stage(name, body, base_url, repeat):
+        articles = [rss.Article.from_entry(entry) for entry in feedparser.parse(body).entries]
+        engine.ENGINE.set_articles(name, articles)
+        total_pages = max(1, engine.ENGINE.paginate(articles, 1)[2])
+        page = [0]
+
+        def run():
+            page[0] = page[0] % total_pages + 1
+            tk_bench.widgets.display_page(tk_bench.container, name, name, page[0])
+            tk_bench.root.update()
+        return measure(run, repeat, min(len(articles), config.ARTICLES_PER_PAGE))
+    return stage
+
+def bench_highlight(tk_bench):
+    def stage(name, body, base_url, repeat):
+        entries = feedparser.parse(body).entries
+        content = "\n".join(rss.summary_snippet(entry.get("summary", "")) for entry in entries)
+        tk_bench.text.config(state="normal")
+        tk_bench.text.delete("1.0", "end")
+        tk_bench.text.insert("1.0", content)
+
+        def run():
+            tk_bench.widgets.highlight_text(tk_bench.text, _WORDS[0])
+            tk_bench.text.config(state="normal")
+        return measure(run, repeat, len(entries))
+    return stage
+
+# -- Display ------------------------------------------------------------------
+
+def ensure_display():
+    """
+    Make sure Tk can open a display, starting Xvfb if there is none.
+    Returns (available, xvfb_process).
+    """
+    if os.environ.get("DISPLAY") or sys.platform in ("win32", "darwin"):
+        return True, None
+    if not shutil.which("Xvfb"):
+        return False, None
+
+    display = f":{random.randint(100, 999)}"
+    process = subprocess.Popen(
+        ["Xvfb", display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    os.environ["DISPLAY"] = display
+    time.sleep(0.5)
+    if process.poll() is not None:
+        return False, None
+    return True, process
+
+# -- Reporting ----------------------------------------------------------------
+
+def print_results(results):
+    print(f"{'stage':<10} {'fixture':<14} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'ops/s':>9} {'entries/s':>11} {'peak KiB':>9}")
+    for key, r in results.items():
+        stage_name, fixture = key.split("/", 1)
+        print(
+            f"{stage_name:<10} {fixture:<14} {r['p50_ms']:>9.2f} {r['p90_ms']:>9.2f} {r['p99_ms']:>9.2f} "
+            f"{r['ops_per_s']:>9.1f} {r['entries_per_s']:>11.0f} {r['peak_kib']:>9.0f}"
+        )
+
+def compare_results(results, baseline_file, threshold=REGRESSION_THRESHOLD):
+    """Print stages whose p50 got slower than the baseline by more than threshold; returns their count."""
+    with open(baseline_file, "r") as f:
+        baseline = json.load(f)
+    regressions = 0
+    for key, r in results.items():
+        before = baseline.get(key)
+        if not before or not before["p50_ms"]:
+            continue
+        change = r["p50_ms"] / before["p50_ms"] - 1
+        if change > threshold:
+            regressions += 1
+            print(f"REGRESSION {key}: p50 {before['p50_ms']:.2f} ms -> {r['p50_ms']:.2f} ms (+{change:.0%})")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the feed pipeline and the article view.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="entry counts of the synthetic fixtures")
+    parser.add_argument("--fixtures", help="directory of recorded *.xml feeds to use instead of synthetic ones")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="timed runs per stage")
+    parser.add_argument("--stages", default="fetch,parse,parse-fp,sort,merge,index,search,render,highlight", help="comma-separated stages to run")
+    parser.add_argument("--save", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON from --save; exit 1 on a p50 regression")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    fixtures = load_fixtures(sizes, args.fixtures)
+    server, base_url = start_fixture_server(fixtures)
+
+    stages = {
+        "fetch": bench_fetch,
+        "parse": bench_parse,
+        "parse-fp": bench_parse_feedparser,
+        "sort": bench_sort,
+        "merge": bench_merge,
+        "index": bench_index,
+        "search": bench_search,
+    }
+    wanted = [name for name in args.stages.split(",") if name]
+    tk_bench = xvfb = None
+    if {"render", "highlight"} & set(wanted):
+        available, xvfb = ensure_display()
+        if available:
+            tk_bench = TkBench()
+            stages["render"] = bench_render(tk_bench)
+            stages["highlight"] = bench_highlight(tk_bench)
+        else:
+            print("No display and no Xvfb found; skipping render and highlight.", file=sys.stderr)
+
+    results = {}
+    try:
+        for stage_name in wanted:
+            stage = stages.get(stage_name)
+            if stage is None:
+                continue
+            for name, body in fixtures.items():
+                results[f"{stage_name}/{name}"] = stage(name, body, base_url, args.repeat)
+    finally:
+        server.shutdown()
+        if tk_bench:
+            tk_bench.close()
+        if xvfb:
+            xvfb.terminate()
+
+    print_results(results)
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=4)
+    if args.compare and compare_results(results, args.compare):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
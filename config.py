@@ -1,8 +1,21 @@
+import atexit
 import json
 import os
+import threading
 
 # Configuration file
 CONFIG_FILE = "rss_config.json"
+CONFIG_SAVE_DELAY_MS = 500  # Rapid changes within this window are written once
+
+# Persistent article store (last known entries per feed)
+ARTICLE_STORE_FILE = "rss_articles.db"
+ARTICLE_STORE_MAX_PER_FEED = 100
+ARTICLE_STORE_MAX_FEEDS = 200
+ARTICLE_STORE_MAX_AGE_DAYS = 30
+
+# Append-only history of every article ever fetched (never evicted)
+ARCHIVE_ENABLED = True
+ARCHIVE_FILE = "rss_history.db"
 
 # Application Constants
 MAX_ROWS = 10
@@ -10,9 +23,46 @@ MIN_ROW = 1
 DEFAULT_ROW = 1
 MAX_ENTRIES_PER_FEED = 100
 ARTICLES_PER_PAGE = 12
-FEED_FETCH_TIMEOUT = 10
-REFRESH_INTERVAL_MS = 300000  # 5 minutes
+FEED_FETCH_TIMEOUT = 10  # Per-source deadline in seconds
+FEED_FETCH_WORKERS = 8  # Concurrent downloads for amalgamated feeds
+STREAMING_PARSE_ENABLED = True
+STREAMING_PARSE_MIN_BYTES = 256 * 1024  # Documents this large use the streaming parser
+HTTP_MAX_CONNECTIONS_PER_HOST = 4  # Concurrent requests to one host
+HTTP_MAX_IDLE_PER_HOST = 4  # Keep-alive connections kept open per host
+HTTP_MAX_IDLE_SECONDS = 15  # Idle keep-alive connections older than this are not reused
+DEDUP_CACHE_SIZE = 20000  # Story fingerprints remembered for duplicate detection
+DEDUP_TITLE_SIMILARITY = 0.6  # Min Jaccard similarity of title words and word pairs for near-duplicates
+DEDUP_TITLE_MIN_WORDS = 4  # Shorter titles are only deduplicated by GUID or link
+REFRESH_INTERVAL_MS = 300000  # 5 minutes (default per-feed interval)
+REFRESH_CHECK_INTERVAL_MS = 15000  # How often the scheduler looks for due feeds
+REFRESH_MIN_INTERVAL_S = 120
+REFRESH_MAX_INTERVAL_S = 21600  # 6 hours
+REFRESH_JITTER = 0.1  # +/- 10% randomisation of each interval
+REFRESH_HISTORY_SIZE = 10  # Fetches/entries considered when adapting
+REFRESH_UNCHANGED_FACTOR = 3  # Interval multiplier when every recent fetch was unchanged
+BACKGROUND_WORKERS = 4
+TASK_POLL_INTERVAL_MS = 50
+
+# Background prefetch of the other categories in the active list
+PREFETCH_ENABLED = True
+PREFETCH_MAX_CONCURRENT = 2
+PREFETCH_MIN_INTERVAL_MS = 250  # Minimum spacing between prefetch requests
 MAX_PAGE_BUTTONS = 5
+SEARCH_DEBOUNCE_MS = 250
+SEARCH_MAX_RESULTS = 500  # Ranked archive search results kept per query
+SEARCH_RANK_CANDIDATES = 10000  # Newest matches ranked for very common terms
+
+# Timing instrumentation (Help → Performance)
+PERF_ENABLED = False
+PERF_HISTORY_SIZE = 1000  # Recent samples kept per span for the percentiles
+PERF_TRACE_FILE = "rss_trace.jsonl"
+
+# Local HTTP/JSON serving mode
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8080
+SERVER_MAX_LIST_ENTRIES = 500  # Merged entries kept per saved list
+SERVER_SEARCH_CACHE_SIZE = 256  # Search result pages kept in memory
+SERVER_KEEPALIVE_TIMEOUT = 15  # Seconds an idle keep-alive connection is kept open
 
 # Text Display Constants
 HEADLINE_TEXT_HEIGHT = 2
@@ -89,6 +139,7 @@ ROOT = None
 # Global variables to track open windows
 FEED_MANAGER_WINDOW = None
 LOCATION_MANAGER_WINDOW = None
+PERFORMANCE_WINDOW = None
 
 # Weather/Location defaults
 DEFAULT_LOCATIONS = [
@@ -106,7 +157,10 @@ ACTIVE_FEED_CONTAINER = None
 
 # Article cache and pagination
 ALL_ARTICLES = {}
+ARTICLES_FETCHED_AT = {}
 CURRENT_PAGE = 1
+SEARCH_TERM = None
+STARTUP_STARTED = None  # perf_counter() at launch in --startup-timing mode
 
 def load_config():
     global SAVED_LISTS, CURRENT_FEEDS, DEFAULT_LIST_NAME, ACTIVE_LIST_NAME, CURRENT_THEME, CURRENT_WEATHER_LOCATION, DEFAULT_LOCATIONS
@@ -158,28 +212,90 @@ def load_config():
         CURRENT_FEEDS = DEFAULT_FEEDS.copy()
         save_config()
 
-def save_config():
-    global SAVED_LISTS, CURRENT_FEEDS, DEFAULT_LIST_NAME, ACTIVE_LIST_NAME, CURRENT_THEME, CURRENT_WEATHER_LOCATION, DEFAULT_LOCATIONS
-    
-    saved_lists_json = {}
-    for list_name, feeds in SAVED_LISTS.items():
-        if isinstance(feeds, list):
-            # Save as [name, url, row]
-            saved_lists_json[list_name] = [[name, url, row] for name, url, row in feeds]
-        else:
-            saved_lists_json[list_name] = feeds
-    
-    data = {
-        "saved_lists": saved_lists_json,
+# Pending configuration snapshot and the timer that will write it
+_SAVE_LOCK = threading.Lock()
+_WRITE_LOCK = threading.Lock()
+_SAVE_TIMER = None
+_PENDING_SAVE = None
+# list name -> (feeds as last written, their JSON text), so unchanged lists are not re-serialized
+_LIST_FRAGMENTS = {}
+
+def _snapshot():
+    """Copy the persisted settings so the write can happen off the Tk thread."""
+    return {
+        "saved_lists": {name: list(feeds) if isinstance(feeds, list) else feeds for name, feeds in SAVED_LISTS.items()},
         "default_list_name": DEFAULT_LIST_NAME,
         "active_list_name": ACTIVE_LIST_NAME,
         "theme": CURRENT_THEME,
         "weather_location": CURRENT_WEATHER_LOCATION,
-        "default_locations": DEFAULT_LOCATIONS
+        "default_locations": list(DEFAULT_LOCATIONS)
     }
+
+def _serialize_list(list_name, feeds):
+    cached = _LIST_FRAGMENTS.get(list_name)
+    if cached is not None and cached[0] == feeds:
+        return cached[1]
+    if isinstance(feeds, list):
+        # Save as [name, url, row]
+        text = json.dumps([[name, url, row] for name, url, row in feeds])
+    else:
+        text = json.dumps(feeds)
+    _LIST_FRAGMENTS[list_name] = (feeds, text)
+    return text
+
+def _write_config(data):
+    """Write a snapshot to CONFIG_FILE atomically (temp file + rename)."""
+    saved_lists = data.pop("saved_lists")
+    for list_name in set(_LIST_FRAGMENTS) - set(saved_lists):
+        del _LIST_FRAGMENTS[list_name]
+
+    lines = [f"    {json.dumps(list_name)}: {_serialize_list(list_name, feeds)}" for list_name, feeds in saved_lists.items()]
+    settings = [f"    {json.dumps(key)}: {json.dumps(value)}" for key, value in data.items()]
+    text = '{\n    "saved_lists": {\n' + ",\n".join("    " + line for line in lines) + "\n    },\n" + ",\n".join(settings) + "\n}\n"
+
+    temp_file = CONFIG_FILE + ".tmp"
     try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, CONFIG_FILE)
         return True
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+def flush_config():
+    """Write any pending configuration change now; returns False if the write failed."""
+    global _SAVE_TIMER, _PENDING_SAVE
+    with _WRITE_LOCK:
+        with _SAVE_LOCK:
+            data, _PENDING_SAVE = _PENDING_SAVE, None
+            if _SAVE_TIMER is not None:
+                _SAVE_TIMER.cancel()
+                _SAVE_TIMER = None
+        if data is None:
+            return True
+        return _write_config(data)
+
+def save_config(wait=False):
+    """
+    Persist the settings. By default the write happens on a background
+    thread after CONFIG_SAVE_DELAY_MS, so a burst of changes costs one
+    write; wait=True writes immediately and returns whether it succeeded.
+    """
+    global _SAVE_TIMER, _PENDING_SAVE
+    data = _snapshot()
+    with _SAVE_LOCK:
+        _PENDING_SAVE = data
+        if _SAVE_TIMER is not None:
+            _SAVE_TIMER.cancel()
+            _SAVE_TIMER = None
+        if not wait:
+            _SAVE_TIMER = threading.Timer(CONFIG_SAVE_DELAY_MS / 1000, flush_config)
+            _SAVE_TIMER.daemon = True
+            _SAVE_TIMER.start()
+            return True
+    return flush_config()
+
+# A change still waiting for its timer is written on interpreter exit
+atexit.register(flush_config)
\ No newline at end of file
@@ -0,0 +1,189 @@
+import hashlib
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import config
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "cmpid", "ocid", "at_medium", "at_campaign"}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+# MinHash signature of a title's shingles, split into bands for bucketing
+_MINHASH_BANDS = 16
+_MINHASH_ROWS = 3
+_MINHASH_BYTES = 4 * _MINHASH_BANDS * _MINHASH_ROWS
+
+def normalize_link(url):
+    """
+    Canonical form of an article URL for duplicate detection: lowercase
+    host without "www.", no fragment, no tracking parameters, sorted query.
+    """
+    if not url or url == "#":
+        return None
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("", host, path, urlencode(query), ""))
+
+def exact_keys(article):
+    """GUID and normalized link keys that identify the same item across sources."""
+    keys = []
+    if article.guid:
+        keys.append("g:" + article.guid)
+    link = normalize_link(article.link)
+    if link:
+        keys.append("l:" + link)
+    return keys
+
+def title_shingles(title):
+    """
+    The words and adjacent word pairs of a title, or None if it has fewer
+    than config.DEDUP_TITLE_MIN_WORDS words (too short to tell stories apart).
+    """
+    words = _WORD_RE.findall((title or "").lower())
+    if len(words) < config.DEDUP_TITLE_MIN_WORDS:
+        return None
+    return frozenset(words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+
+def similarity(a, b):
+    """
+    Jaccard similarity of two titles' shingles; titles that are the same
+    story score at least config.DEDUP_TITLE_SIMILARITY.
+
+    >>> similarity("Earthquake strikes off coast of Japan", "Earthquake strikes off the coast of Japan") >= config.DEDUP_TITLE_SIMILARITY
+    True
+    >>> similarity("Fed raises interest rates by quarter point", "Fed raises interest rates by a quarter point") >= config.DEDUP_TITLE_SIMILARITY
+    True
+    >>> similarity("Man United beat Liverpool 2-1", "Liverpool beat Man United 2-1") >= config.DEDUP_TITLE_SIMILARITY
+    False
+    >>> similarity("Storm closes schools across the region", "Council approves new budget for schools") >= config.DEDUP_TITLE_SIMILARITY
+    False
+    """
+    a, b = title_shingles(a), title_shingles(b)
+    if not a or not b:
+        return 0.0
+    return _jaccard(a, b)
+
+def _jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+def _bands(shingles):
+    """MinHash the shingles and group the signature into LSH bands."""
+    # One SHAKE digest per shingle supplies an independent 32-bit hash per permutation
+    hashes = [array("I", hashlib.shake_128(shingle.encode("utf-8")).digest(_MINHASH_BYTES)) for shingle in shingles]
+    signature = list(map(min, zip(*hashes)))
+    return [
+        (i, tuple(signature[i * _MINHASH_ROWS:(i + 1) * _MINHASH_ROWS]))
+        for i in range(_MINHASH_BANDS)
+    ]
+
+class SeenStories:
+    """
+    Bounded LRU of story fingerprints (exact keys and title shingles), each
+    mapped to the id of the story it was first seen as. Titles are bucketed
+    by MinHash bands, so a title similar to a remembered one almost always
+    shares a bucket with it; candidates are then checked by exact Jaccard.
+
+    Titles only match across different sources, and a story never takes two
+    items with different GUIDs from the same source.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._keys = OrderedDict()
+        self._titles = OrderedDict()
+        self._members = OrderedDict()
+        self._buckets = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def story_id(self, article):
+        """Return the story id of article, registering it if it is new."""
+        keys = exact_keys(article)
+        shingles = title_shingles(article.title)
+        bands = _bands(shingles) if shingles else None
+
+        with self._lock:
+            story = None
+            for key in keys:
+                if key in self._keys and self._can_join(self._keys[key], article):
+                    story = self._keys[key]
+                    break
+            if story is None and shingles:
+                story = self._find_similar(article, shingles, bands)
+            if story is None:
+                story = self._next_id
+                self._next_id += 1
+
+            for key in keys:
+                self._remember(self._keys, key, story)
+            if shingles:
+                title_key = (article.source_url, shingles)
+                if title_key in self._titles:
+                    self._titles.move_to_end(title_key)
+                else:
+                    for band in bands:
+                        self._buckets.setdefault(band, set()).add(title_key)
+                    self._remember(self._titles, title_key, (story, bands))
+            members = self._members.get(story) or {}
+            members.setdefault(article.source_url, article.guid)
+            self._remember(self._members, story, members)
+            return story
+
+    def _can_join(self, story, article):
+        # Two different items from one source are never the same story
+        guid = self._members.get(story, {}).get(article.source_url)
+        return not (guid and article.guid and guid != article.guid)
+
+    def _find_similar(self, article, shingles, bands):
+        best, best_score = None, config.DEDUP_TITLE_SIMILARITY
+        seen = set()
+        for band in bands:
+            for candidate in self._buckets.get(band, ()):
+                source_url, candidate_shingles = candidate
+                if candidate in seen or source_url == article.source_url:
+                    continue
+                seen.add(candidate)
+                score = _jaccard(shingles, candidate_shingles)
+                story = self._titles[candidate][0]
+                if score >= best_score and self._can_join(story, article):
+                    best, best_score = story, score
+        return best
+
+    def _remember(self, table, key, value):
+        table[key] = value
+        table.move_to_end(key)
+        while len(table) > self.max_size:
+            old_key, old_value = table.popitem(last=False)
+            if table is self._titles:
+                for band in old_value[1]:
+                    bucket = self._buckets.get(band)
+                    if bucket is not None:
+                        bucket.discard(old_key)
+                        if not bucket:
+                            del self._buckets[band]
+
+SEEN_STORIES = SeenStories(config.DEDUP_CACHE_SIZE)
+
+def unique(articles):
+    """Yield articles in order, skipping any whose story was already yielded."""
+    yielded = set()
+    for article in articles:
+        story = SEEN_STORIES.story_id(article)
+        if story in yielded:
+            continue
+        yielded.add(story)
+        yield article
\ No newline at end of file
@@ -1,8 +1,11 @@
+import datetime
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, scrolledtext
 import config
 import themes
 import rss
+import engine
 
 def get_feed_list_index_by_name(feed_name):
     """Helper function to find index in CURRENT_FEEDS list."""
@@ -283,7 +286,8 @@ def add_feed(refresh_listbox, button_frame, scrollable_frame, parent_win):
         messagebox.showwarning("Warning", f"A feed named '{name}' already exists.", parent=parent_win)
         return
 
-    valid, error_msg = rss.validate_feed(url)
+    source_entries = []
+    valid, error_msg, entries = rss.validate_and_fetch(url, on_sources=source_entries.extend)
     
     if not valid:
         messagebox.showerror("Invalid Feed", f"Feed validation failed:\n{error_msg}", parent=parent_win)
@@ -292,8 +296,11 @@ def add_feed(refresh_listbox, button_frame, scrollable_frame, parent_win):
     config.CURRENT_FEEDS.append((name, url, row))
     config.SAVED_LISTS[config.ACTIVE_LIST_NAME] = config.CURRENT_FEEDS.copy()
     
-    refresh_listbox()
+    # Reuse the validation download instead of fetching the feed again
+    engine.ENGINE.seed(url, entries, source_entries)
     from widgets import update_category_buttons
+
+    refresh_listbox()
     update_category_buttons(button_frame, scrollable_frame)
     
     url_count = len(rss.parse_feed_urls(url))
@@ -394,7 +401,8 @@ def edit_feed(listbox, refresh_listbox, button_frame, scrollable_frame, parent_w
             return
 
         if old_url != new_url:
-            valid, error_msg = rss.validate_feed(new_url)
+            source_entries = []
+            valid, error_msg, entries = rss.validate_and_fetch(new_url, on_sources=source_entries.extend)
             if not valid:
                 messagebox.showerror("Invalid Feed", f"Validation failed:\n{error_msg}", parent=parent_win)
                 return
@@ -402,8 +410,10 @@ def edit_feed(listbox, refresh_listbox, button_frame, scrollable_frame, parent_w
         was_active = old_url == config.ACTIVE_FEED_URL
         config.CURRENT_FEEDS[current_index] = (new_name, new_url, new_row)
 
-        if old_url != new_url and old_url in config.ALL_ARTICLES:
-            config.ALL_ARTICLES[new_url] = config.ALL_ARTICLES.pop(old_url)
+        if old_url != new_url:
+            # Reuse the validation download instead of fetching the feed again
+            engine.ENGINE.seed(new_url, entries, source_entries)
+            engine.ENGINE.remove_feed(old_url)
 
         config.SAVED_LISTS[config.ACTIVE_LIST_NAME] = config.CURRENT_FEEDS.copy()
 
@@ -641,7 +651,7 @@ def delete_list_dialog():
 def save_current_list():
     """Save current memory feeds to disk."""
     config.SAVED_LISTS[config.ACTIVE_LIST_NAME] = config.CURRENT_FEEDS.copy()
-    if config.save_config():
+    if config.save_config(wait=True):
         messagebox.showinfo("Saved", f"Changes to '{config.ACTIVE_LIST_NAME}' have been saved to disk.", parent=config.ROOT)
     else:
         messagebox.showerror("Error", "Failed to save configuration file.", parent=config.ROOT)
@@ -658,4 +668,94 @@ def save_current_list_as():
     config.SAVED_LISTS[list_name] = config.CURRENT_FEEDS.copy()
     config.ACTIVE_LIST_NAME = list_name # Switch to new list
     config.save_config()
-    messagebox.showinfo("Saved", f"Saved as '{list_name}'.", parent=config.ROOT)
\ No newline at end of file
+    messagebox.showinfo("Saved", f"Saved as '{list_name}'.", parent=config.ROOT)
+
+HISTORY_RANGES = ["Today", "Yesterday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday",
+                  "Last 7 days", "Last 30 days", "All time", "Custom"]
+
+def history_range(choice, date_from="", date_to=""):
+    """
+    (start, end) timestamps of a HISTORY_RANGES choice in local time; None
+    leaves that side open. A weekday means its most recent occurrence.
+    Custom ranges take inclusive YYYY-MM-DD dates and raise ValueError.
+    """
+    def midnight(day):
+        return time.mktime(day.timetuple())
+
+    today = datetime.date.today()
+    one_day = datetime.timedelta(days=1)
+    if choice == "Today":
+        return midnight(today), None
+    if choice == "Yesterday":
+        return midnight(today - one_day), midnight(today)
+    if choice in HISTORY_RANGES[2:9]:
+        day = today - datetime.timedelta(days=(today.weekday() - HISTORY_RANGES.index(choice) + 2) % 7)
+        return midnight(day), midnight(day + one_day)
+    if choice == "Last 7 days":
+        return midnight(today - 6 * one_day), None
+    if choice == "Last 30 days":
+        return midnight(today - 29 * one_day), None
+    if choice == "Custom":
+        start = midnight(datetime.date.fromisoformat(date_from.strip())) if date_from.strip() else None
+        end = midnight(datetime.date.fromisoformat(date_to.strip()) + one_day) if date_to.strip() else None
+        return start, end
+    return None, None
+
+def history_dialog(scrollable_frame):
+    """Pick a time range and feed scope, then page through the history archive."""
+    dialog = tk.Toplevel(config.ROOT)
+    dialog.title("Browse History")
+    dialog.geometry("340x300")
+    dialog.transient(config.ROOT)
+    dialog.grab_set()
+
+    theme = themes.THEMES[config.CURRENT_THEME]
+    dialog.configure(bg=theme["bg"])
+
+    frame = tk.Frame(dialog, bg=theme["frame_bg"], padx=20, pady=20)
+    frame.pack(fill="both", expand=True)
+
+    tk.Label(frame, text="Browse Article History", font=("Arial", 12, "bold"), bg=theme["frame_bg"], fg=theme["headline_fg"]).pack(pady=(0, 10))
+
+    range_var = tk.StringVar(value="Today")
+    ttk.Combobox(frame, textvariable=range_var, values=HISTORY_RANGES, state="readonly").pack(fill="x")
+
+    dates = tk.Frame(frame, bg=theme["frame_bg"])
+    dates.pack(fill="x", pady=(10, 0))
+    tk.Label(dates, text="From", bg=theme["frame_bg"], fg=theme["fg"]).pack(side="left")
+    from_entry = tk.Entry(dates, width=11, bg=theme["entry_bg"], fg=theme["entry_fg"])
+    from_entry.pack(side="left", padx=5)
+    tk.Label(dates, text="To", bg=theme["frame_bg"], fg=theme["fg"]).pack(side="left")
+    to_entry = tk.Entry(dates, width=11, bg=theme["entry_bg"], fg=theme["entry_fg"])
+    to_entry.pack(side="left", padx=5)
+    tk.Label(frame, text="Custom dates as YYYY-MM-DD", font=("Arial", 8, "italic"), bg=theme["frame_bg"], fg=theme["summary_fg"]).pack(anchor="w")
+
+    scope_var = tk.StringVar(value="feed" if config.ACTIVE_FEED_URL in [url for _, url, _ in config.CURRENT_FEEDS] else "list")
+    tk.Radiobutton(frame, text="Active feed", variable=scope_var, value="feed", bg=theme["frame_bg"], fg=theme["fg"], selectcolor=theme["entry_bg"]).pack(anchor="w", pady=(10, 0))
+    tk.Radiobutton(frame, text=f"All feeds in '{config.ACTIVE_LIST_NAME}'", variable=scope_var, value="list", bg=theme["frame_bg"], fg=theme["fg"], selectcolor=theme["entry_bg"]).pack(anchor="w", pady=(0, 15))
+
+    def show():
+        choice = range_var.get()
+        try:
+            start, end = history_range(choice, from_entry.get(), to_entry.get())
+        except ValueError:
+            messagebox.showwarning("Warning", "Enter dates as YYYY-MM-DD.", parent=dialog)
+            return
+
+        feed_names = {url: name for name, url, _ in config.CURRENT_FEEDS}
+        if scope_var.get() == "feed" and config.ACTIVE_FEED_URL in feed_names:
+            source_urls = rss.parse_feed_urls(config.ACTIVE_FEED_URL)
+            scope_name = feed_names[config.ACTIVE_FEED_URL]
+        else:
+            source_urls = [source for url in feed_names for source in rss.parse_feed_urls(url)]
+            scope_name = config.ACTIVE_LIST_NAME
+        if choice == "Custom":
+            choice = f"{from_entry.get().strip() or '…'} to {to_entry.get().strip() or '…'}"
+
+        dialog.destroy()
+        from widgets import show_history
+        show_history(scrollable_frame, source_urls, start, end, f"{scope_name} ({choice})")
+
+    ttk.Button(frame, text="Show", command=show).pack(side="left", expand=True)
+    ttk.Button(frame, text="Cancel", command=dialog.destroy).pack(side="right", expand=True)
+    themes.apply_theme_to_widget(dialog, config.CURRENT_THEME)
\ No newline at end of file
@@ -0,0 +1,184 @@
+import threading
+import time
+
+import archive
+import config
+import rss
+import scheduler
+import search
+import store
+
+def _close(entries):
+    # Attached read-only views (snapshot.Snapshot) hold an open file and mapping
+    close = getattr(entries, "close", None)
+    if close is not None:
+        close()
+
+class FeedEngine:
+    """
+    Headless fetch/aggregate engine: the article cache, its search index and
+    pagination, usable without Tk. fetch() is safe on any thread; the methods
+    that touch the cache serialise on an internal lock.
+    """
+
+    def __init__(self, articles=None, fetched_at=None, persist=True, max_entries=None):
+        self.articles = {} if articles is None else articles
+        self.fetched_at = {} if fetched_at is None else fetched_at
+        self.persist = persist
+        self.max_entries = max_entries or config.MAX_ENTRIES_PER_FEED
+        self.index = search.SearchIndex()
+        self._lock = threading.RLock()
+
+    def fetch(self, feed_url, cancel_event=None):
+        """
+        Download feed_url, record the outcome with the refresh scheduler and
+        persist the entries. Does not touch the cache; returns the entries.
+        """
+        try:
+            entries = rss.fetch_feed_entries(
+                feed_url, max_entries=self.max_entries, cancel_event=cancel_event, on_sources=self.archive_sources
+            )
+        except rss.FetchCancelled:
+            raise
+        except Exception:
+            scheduler.record_error(feed_url)
+            raise
+        scheduler.record_success(feed_url, entries, *rss.get_feed_hints(feed_url))
+        if self.persist:
+            store.save_entries(feed_url, entries)
+        return entries
+
+    def archive_sources(self, source_entries):
+        """
+        Archive every source's own entry list, including the entries the
+        merge into one feed drops (other sources' newer items, duplicates).
+        """
+        if self.persist and config.ARCHIVE_ENABLED:
+            archive.append([entry for entries in source_entries for entry in entries])
+
+    def set_articles(self, feed_url, entries):
+        """Replace the cached entries of feed_url (and their search index)."""
+        with self._lock:
+            self.articles[feed_url] = entries
+            self.index.index_feed(feed_url, entries)
+
+    def attach(self, feed_url, entries):
+        """
+        Show read-only entries (e.g. a memory-mapped snapshot) under feed_url.
+        They are neither indexed for search nor persisted, so nothing walks them.
+        """
+        with self._lock:
+            self.index.remove_feed(feed_url)
+            replaced = self.articles.get(feed_url)
+            self.articles[feed_url] = entries
+        if replaced is not entries:
+            _close(replaced)
+
+    def remove_feed(self, feed_url):
+        """Forget everything cached for feed_url, closing attached entries that hold a file."""
+        with self._lock:
+            entries = self.articles.pop(feed_url, None)
+            self.fetched_at.pop(feed_url, None)
+            self.index.remove_feed(feed_url)
+        _close(entries)
+
+    def ingest(self, feed_url, entries):
+        """
+        Merge freshly fetched entries into the cache.
+        Only the delta against the cached list is applied; returns True if
+        anything was added, updated or removed.
+        """
+        with self._lock:
+            self.fetched_at[feed_url] = time.time()
+            existing = self.articles.get(feed_url)
+            if existing is None:
+                self.set_articles(feed_url, entries)
+                return True
+
+            added, updated, removed = rss.diff_entries(existing, entries)
+            if not (added or updated or removed):
+                return False
+            self.set_articles(feed_url, rss.merge_entries(existing, added, updated, removed, self.max_entries))
+            return True
+
+    def seed(self, feed_url, entries, source_entries=None):
+        """
+        Cache and persist entries that were already downloaded (e.g. while
+        validating). source_entries are the per-source lists before the
+        merge; they are archived instead of entries when given.
+        """
+        self.ingest(feed_url, entries)
+        scheduler.record_success(feed_url, entries, *rss.get_feed_hints(feed_url))
+        if self.persist:
+            store.save_entries(feed_url, entries)
+        self.archive_sources(source_entries if source_entries is not None else [entries])
+
+    def load_cached(self, feed_url):
+        """Entries of feed_url from memory, else from the persistent store ([] if none)."""
+        with self._lock:
+            entries = self.articles.get(feed_url)
+            if entries:
+                return entries
+            entries = store.load_entries(feed_url) if self.persist else []
+            if entries:
+                self.set_articles(feed_url, entries)
+            return entries
+
+    def is_fresh(self, feed_url):
+        """True if feed_url was fetched recently enough that a refetch is wasteful."""
+        fetched_at = self.fetched_at.get(feed_url)
+        return fetched_at is not None and time.time() - fetched_at < config.REFRESH_INTERVAL_MS / 1000
+
+    def refresh(self, feed_url):
+        """Fetch and ingest feed_url synchronously; returns True if it changed."""
+        return self.ingest(feed_url, self.fetch(feed_url))
+
+    def refresh_due(self, feed_urls):
+        """Refresh every feed whose adaptive interval has elapsed; returns the changed ones."""
+        changed = []
+        for feed_url in scheduler.due_feeds(feed_urls):
+            scheduler.postpone(feed_url)
+            try:
+                if self.refresh(feed_url):
+                    changed.append(feed_url)
+            except Exception:
+                continue
+        return changed
+
+    @property
+    def version(self):
+        """Changes whenever the searchable entries do (see SearchIndex.version)."""
+        return self.index.version
+
+    def query(self, term):
+        """Entries of every cached feed matching term, newest first."""
+        with self._lock:
+            return self.index.search(term)
+
+    def entries(self, feed_url=None, term=None):
+        """The entries of feed_url, or the search results for term if given."""
+        if term:
+            return self.query(term)
+        with self._lock:
+            return self.articles.get(feed_url, [])
+
+    def paginate(self, entries, page_number, per_page=None):
+        """
+        Slice entries into a page. page_number is clamped to the valid range.
+        Returns (page_entries, page_number, total_pages); total_pages is 0
+        when there are no entries.
+        """
+        per_page = per_page or config.ARTICLES_PER_PAGE
+        total_articles = len(entries)
+        total_pages = (total_articles + per_page - 1) // per_page
+
+        if total_pages > 0:
+            page_number = min(max(page_number, 1), total_pages)
+        else:
+            page_number = 1
+
+        start_index = (page_number - 1) * per_page
+        return entries[start_index:start_index + per_page], page_number, total_pages
+
+# Engine behind the GUI, sharing the runtime caches in config
+ENGINE = FeedEngine(config.ALL_ARTICLES, config.ARTICLES_FETCHED_AT)
\ No newline at end of file
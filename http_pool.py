@@ -0,0 +1,215 @@
+import gzip
+import http.client
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from urllib.parse import urlsplit, urljoin
+
+import config
+import perf
+
+try:
+    import brotli  # Optional: enables "br" content encoding
+except ImportError:
+    brotli = None
+
+USER_AGENT = 'NewsViewerApp/1.0'
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli else "gzip, deflate"
+
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+_MAX_REDIRECTS = 5
+
+# Idle keep-alive connections per (scheme, host, port) as (connection, checked in at),
+# and per-host request caps
+_IDLE = {}
+_HOST_LIMITS = {}
+_LOCK = threading.Lock()
+_SSL_CONTEXT = None
+
+class HTTPError(Exception):
+    """Raised for HTTP error statuses (4xx/5xx)."""
+
+    def __init__(self, url, status, reason):
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.url = url
+        self.status = status
+
+def _host_key(parts):
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    return parts.scheme, parts.hostname, port
+
+def _host_limit(key):
+    with _LOCK:
+        limit = _HOST_LIMITS.get(key)
+        if limit is None:
+            limit = _HOST_LIMITS[key] = threading.BoundedSemaphore(config.HTTP_MAX_CONNECTIONS_PER_HOST)
+        return limit
+
+def _new_connection(key, timeout):
+    global _SSL_CONTEXT
+    scheme, host, port = key
+    if scheme == "https":
+        with _LOCK:
+            if _SSL_CONTEXT is None:
+                _SSL_CONTEXT = ssl.create_default_context()
+        return http.client.HTTPSConnection(host, port, timeout=timeout, context=_SSL_CONTEXT)
+    return http.client.HTTPConnection(host, port, timeout=timeout)
+
+def _checkout(key, timeout):
+    """
+    Return (connection, reused): the most recently used idle keep-alive
+    connection, or a new one. Idle connections older than
+    config.HTTP_MAX_IDLE_SECONDS are closed rather than reused.
+    """
+    stale = []
+    conn = None
+    with _LOCK:
+        idle = _IDLE.get(key)
+        oldest = time.monotonic() - config.HTTP_MAX_IDLE_SECONDS
+        while idle:
+            candidate, checked_in = idle.pop()
+            if checked_in < oldest:
+                stale.append(candidate)
+            else:
+                conn = candidate
+                break
+    for candidate in stale:
+        candidate.close()
+
+    if conn is None:
+        return _new_connection(key, timeout), False
+    conn.timeout = timeout
+    if conn.sock is not None:
+        conn.sock.settimeout(timeout)
+    return conn, True
+
+def _checkin(key, conn):
+    with _LOCK:
+        idle = _IDLE.setdefault(key, [])
+        if len(idle) < config.HTTP_MAX_IDLE_PER_HOST:
+            idle.append((conn, time.monotonic()))
+            return
+    conn.close()
+
+def _drop_idle(key):
+    """Close every idle connection to one host (after one of them turned out dead)."""
+    with _LOCK:
+        idle = _IDLE.pop(key, [])
+    for conn, _ in idle:
+        conn.close()
+
+def close_all():
+    """Close every idle pooled connection."""
+    with _LOCK:
+        connections = [conn for idle in _IDLE.values() for conn, _ in idle]
+        _IDLE.clear()
+    for conn in connections:
+        conn.close()
+
+def _decode_body(body, encoding):
+    encoding = (encoding or "").strip().lower()
+    if encoding in ("gzip", "x-gzip"):
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)  # Raw deflate stream
+    if encoding == "br" and brotli:
+        return brotli.decompress(body)
+    return body
+
+def _uses_proxy(parts):
+    proxies = urllib.request.getproxies()
+    return parts.scheme in proxies and not urllib.request.proxy_bypass(parts.hostname or "")
+
+def _request_via_urllib(url, headers, timeout):
+    """Fallback for proxied URLs: plain urllib, no pooling."""
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response_headers = {name.lower(): value for name, value in response.headers.items()}
+            body = _decode_body(response.read(), response_headers.get("content-encoding"))
+            return response.status, body, response_headers, response.geturl()
+    except urllib.error.HTTPError as e:
+        if e.code < 400:
+            return e.code, b"", {name.lower(): value for name, value in e.headers.items()}, url
+        raise HTTPError(url, e.code, e.reason)
+
+def _connect(conn, host):
+    """Open a new connection (DNS lookup, TCP and TLS handshakes) as its own timing span."""
+    with perf.span("connect", host=host):
+        conn.connect()
+
+def _send(conn, path, headers):
+    conn.request("GET", path, headers=headers)
+    return conn.getresponse()
+
+def get(url, headers=None, timeout=None):
+    """
+    GET url over a pooled keep-alive connection.
+    Follows redirects, negotiates gzip/deflate (and brotli when installed)
+    and transparently decompresses the body. At most
+    config.HTTP_MAX_CONNECTIONS_PER_HOST requests run against one host at a time.
+    Returns (status, body, headers, final_url) with lowercased header names;
+    raises HTTPError for 4xx/5xx and the socket error on network failure.
+    """
+    if timeout is None:
+        timeout = config.FEED_FETCH_TIMEOUT
+    request_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": ACCEPT_ENCODING}
+    request_headers.update(headers or {})
+
+    for _ in range(_MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        if _uses_proxy(parts):
+            return _request_via_urllib(url, request_headers, timeout)
+
+        key = _host_key(parts)
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        with _host_limit(key):
+            conn, reused = _checkout(key, timeout)
+            try:
+                try:
+                    if not reused:
+                        _connect(conn, parts.hostname)
+                    response = _send(conn, path, request_headers)
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.CannotSendRequest):
+                    if not reused:
+                        raise
+                    # The server closed the idle connection, and the others idle to
+                    # this host are likely just as stale: drop them all and retry
+                    # once on a brand-new connection
+                    conn.close()
+                    _drop_idle(key)
+                    conn = _new_connection(key, timeout)
+                    _connect(conn, parts.hostname)
+                    response = _send(conn, path, request_headers)
+
+                body = response.read()
+                status = response.status
+                response_headers = {name.lower(): value for name, value in response.getheaders()}
+            except Exception:
+                conn.close()
+                raise
+
+            if response.will_close:
+                conn.close()
+            else:
+                _checkin(key, conn)
+
+        if status in _REDIRECT_CODES and "location" in response_headers:
+            url = urljoin(url, response_headers["location"])
+            continue
+        if status >= 400:
+            raise HTTPError(url, status, response.reason)
+        return status, _decode_body(body, response_headers.get("content-encoding")), response_headers, url
+
+    raise HTTPError(url, status, "Too many redirects")
\ No newline at end of file
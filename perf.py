@@ -0,0 +1,127 @@
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+import config
+
+_LOCK = threading.Lock()
+# span name -> {"samples": recent durations in seconds, "count": int, "total": seconds}
+_STATS = {}
+_TRACE_FILE = None
+_STARTUP_MARKS = set()
+
+class _NullSpan:
+    """Shared no-op span returned while instrumentation is disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _Span:
+    __slots__ = ("name", "attrs", "started")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record(self.name, time.perf_counter() - self.started, self.attrs, exc_type)
+        return False
+
+def span(name, **attrs):
+    """
+    Context manager timing one occurrence of name. Keyword arguments are
+    written to the trace. While config.PERF_ENABLED is off this returns a
+    shared no-op object, so the cost is one attribute lookup.
+    """
+    if not config.PERF_ENABLED:
+        return _NULL_SPAN
+    return _Span(name, attrs)
+
+def record(name, seconds, attrs=None, exc_type=None):
+    """Add one sample to the rolling window of name (and the trace, if open)."""
+    with _LOCK:
+        stats = _STATS.get(name)
+        if stats is None:
+            stats = _STATS[name] = {"samples": deque(maxlen=config.PERF_HISTORY_SIZE), "count": 0, "total": 0.0}
+        stats["samples"].append(seconds)
+        stats["count"] += 1
+        stats["total"] += seconds
+
+        if _TRACE_FILE is not None:
+            event = {"ts": round(time.time(), 6), "span": name, "ms": round(seconds * 1000, 3), "thread": threading.current_thread().name}
+            if attrs:
+                event.update(attrs)
+            if exc_type is not None:
+                event["error"] = exc_type.__name__
+            _TRACE_FILE.write(json.dumps(event) + "\n")
+
+def _percentile(sorted_values, fraction):
+    return sorted_values[round(fraction * (len(sorted_values) - 1))]
+
+def summary():
+    """
+    One row per span, slowest total first:
+    (name, count, p50_ms, p90_ms, p99_ms, max_ms, total_ms).
+    Percentiles cover the last config.PERF_HISTORY_SIZE samples.
+    """
+    with _LOCK:
+        snapshot = [(name, stats["count"], sorted(stats["samples"]), stats["total"]) for name, stats in _STATS.items()]
+
+    rows = []
+    for name, count, samples, total in snapshot:
+        rows.append((
+            name,
+            count,
+            _percentile(samples, 0.50) * 1000,
+            _percentile(samples, 0.90) * 1000,
+            _percentile(samples, 0.99) * 1000,
+            samples[-1] * 1000,
+            total * 1000,
+        ))
+    rows.sort(key=lambda row: row[6], reverse=True)
+    return rows
+
+def reset():
+    with _LOCK:
+        _STATS.clear()
+
+def start_trace(path=None):
+    """Append every following span to a JSONL file (config.PERF_TRACE_FILE by default)."""
+    global _TRACE_FILE
+    stop_trace()
+    with _LOCK:
+        _TRACE_FILE = open(path or config.PERF_TRACE_FILE, "a", encoding="utf-8", buffering=1)
+
+def stop_trace():
+    global _TRACE_FILE
+    with _LOCK:
+        if _TRACE_FILE is not None:
+            _TRACE_FILE.close()
+            _TRACE_FILE = None
+
+def is_tracing():
+    return _TRACE_FILE is not None
+
+def startup_mark(label):
+    """
+    In startup-timing mode (config.STARTUP_STARTED set), print the time
+    since launch the first time each milestone is reached.
+    """
+    if config.STARTUP_STARTED is None or label in _STARTUP_MARKS:
+        return
+    _STARTUP_MARKS.add(label)
+    elapsed = time.perf_counter() - config.STARTUP_STARTED
+    record(f"startup.{label}", elapsed)
+    print(f"startup: {label} after {elapsed * 1000:.0f} ms", file=sys.stderr)
\ No newline at end of file
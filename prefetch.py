@@ -0,0 +1,104 @@
+import heapq
+import threading
+import time
+
+import config
+import scheduler
+import tasks
+
+# Pending prefetch work: heap of (priority, sequence, feed_url)
+_QUEUE = []
+_QUEUE_LOCK = threading.Lock()
+_IN_FLIGHT = set()
+_ACTIVE_WORKERS = 0
+_NEXT_START = 0.0
+
+def feed_priorities(feeds, active_url):
+    """
+    Order feeds for prefetching: the active feed first, then the other feeds
+    on the same row, then everything else in list order.
+    Returns a list of (priority, feed_url).
+    """
+    active_row = None
+    for name, url, row in feeds:
+        if url == active_url:
+            active_row = row
+            break
+
+    ordered = []
+    seen = set()
+    for name, url, row in feeds:
+        if url in seen:
+            continue
+        seen.add(url)
+        if url == active_url:
+            priority = 0
+        elif row == active_row:
+            priority = 1
+        else:
+            priority = 2
+        ordered.append((priority, url))
+    ordered.sort(key=lambda item: item[0])
+    return ordered
+
+def schedule(feeds, active_url, fetch, on_fetched, is_fresh):
+    """
+    Replace the prefetch queue with every feed in feeds that is not
+    is_fresh(feed_url) and not backing off after a failure, by priority. fetch(feed_url) runs on a prefetch
+    worker; on_fetched(feed_url, entries) is then called on the Tk thread.
+    The active feed itself is skipped because the display fetch is already
+    loading it.
+    """
+    global _QUEUE
+    if not config.PREFETCH_ENABLED:
+        return
+
+    with _QUEUE_LOCK:
+        _QUEUE = [
+            (priority, seq, url)
+            for seq, (priority, url) in enumerate(feed_priorities(feeds, active_url))
+            if url != active_url and url not in _IN_FLIGHT and not is_fresh(url) and not scheduler.is_backing_off(url)
+        ]
+        heapq.heapify(_QUEUE)
+        workers_needed = min(config.PREFETCH_MAX_CONCURRENT, len(_QUEUE)) - _ACTIVE_WORKERS
+
+    for _ in range(max(0, workers_needed)):
+        _start_worker(fetch, on_fetched)
+
+def _start_worker(fetch, on_fetched):
+    global _ACTIVE_WORKERS
+    with _QUEUE_LOCK:
+        _ACTIVE_WORKERS += 1
+    threading.Thread(target=_worker, args=(fetch, on_fetched), name="prefetch", daemon=True).start()
+
+def _next_url():
+    """Pop the highest priority feed, honouring the minimum spacing between requests."""
+    global _NEXT_START, _ACTIVE_WORKERS
+    while True:
+        with _QUEUE_LOCK:
+            if not _QUEUE:
+                _ACTIVE_WORKERS -= 1
+                return None
+            now = time.monotonic()
+            if now >= _NEXT_START:
+                _, _, url = heapq.heappop(_QUEUE)
+                _IN_FLIGHT.add(url)
+                _NEXT_START = now + config.PREFETCH_MIN_INTERVAL_MS / 1000
+                return url
+            wait = _NEXT_START - now
+        time.sleep(wait)
+
+def _worker(fetch, on_fetched):
+    while True:
+        url = _next_url()
+        if url is None:
+            return
+        try:
+            entries = fetch(url)
+        except Exception:
+            entries = None
+        finally:
+            with _QUEUE_LOCK:
+                _IN_FLIGHT.discard(url)
+        if entries is not None:
+            tasks.call_soon(lambda value, u=url: on_fetched(u, value), entries)
\ No newline at end of file
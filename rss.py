@@ -1,8 +1,55 @@
-import feedparser
+import calendar
+import heapq
+import itertools
 import socket
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
+import threading
 import time
 
+import config
+import dedup
+import http_pool
+import perf
+import streamparse
+
+# Shared worker pool for downloading the sources of a feed concurrently
+_FETCH_EXECUTOR = None
+_FETCH_EXECUTOR_LOCK = threading.Lock()
+
+class FetchCancelled(Exception):
+    """Raised when a fetch is abandoned because its cancel_event was set."""
+
+class FeedFormatError(Exception):
+    """Raised when a downloaded document is not a usable feed."""
+
+# Conditional GET validators per source URL:
+# url -> {"etag": ..., "modified": ..., "entries": [...]}
+_VALIDATORS = {}
+_VALIDATORS_LOCK = threading.Lock()
+
+# Refresh hints per source URL from the last download:
+# url -> {"not_modified": bool, "update_hint": seconds or None}
+_SOURCE_INFO = {}
+
+# sy:updatePeriod values in seconds
+_UPDATE_PERIODS = {
+    "hourly": 3600,
+    "daily": 86400,
+    "weekly": 604800,
+    "monthly": 2592000,
+    "yearly": 31536000,
+}
+
+# First-seen time of undated entries (bounded LRU keyed by id/link/title)
+_FIRST_SEEN = OrderedDict()
+_FIRST_SEEN_LOCK = threading.Lock()
+_FIRST_SEEN_LIMIT = 10000
+
+# How often the deadline check runs while waiting on sources (seconds)
+_DEADLINE_POLL_INTERVAL = 0.1
+
 def parse_feed_urls(url_string):
     """
     Parse comma-separated URLs from a string.
@@ -23,83 +70,176 @@ def validate_feed(feed_url, timeout=10):
     Validate RSS feed before adding. Returns (valid, error_message).
     Now supports comma-separated URLs for amalgamation.
     """
+    valid, message, _ = validate_and_fetch(feed_url, timeout)
+    return valid, message
+
+def validate_and_fetch(feed_url, timeout=10, max_entries=100, on_sources=None):
+    """
+    Validate RSS feed before adding, downloading all sources concurrently
+    with a per-request timeout. Returns (valid, message, entries) where
+    entries are the merged articles of a valid feed (ready to be cached,
+    so adding the feed costs a single download) or [] if invalid.
+    For a valid feed, on_sources (if given) is called with every source's
+    own entry list before the merge cuts them to max_entries.
+    """
     try:
         # Basic URL validation
         if not feed_url or not isinstance(feed_url, str):
-            return False, "URL must be a string"
+            return False, "URL must be a string", []
         
         feed_url = feed_url.strip()
         
         if not feed_url:
-            return False, "URL cannot be empty"
+            return False, "URL cannot be empty", []
         
         # Parse multiple URLs if comma-separated
         urls = parse_feed_urls(feed_url)
         
         if not urls:
-            return False, "No valid URLs found"
+            return False, "No valid URLs found", []
         
-        # Validate each URL
         for i, url in enumerate(urls):
             if not url.startswith(('http://', 'https://')):
-                return False, f"URL {i+1} must start with http:// or https://"
-            
-            # Set socket timeout for the request
-            old_timeout = socket.getdefaulttimeout()
-            socket.setdefaulttimeout(timeout)
-            
-            try:
-                # Try to fetch the feed
-                feed = feedparser.parse(
-                    url, 
-                    request_headers={'User-Agent': 'NewsViewerApp/1.0'}
-                )
-            finally:
-                # Restore original timeout
-                socket.setdefaulttimeout(old_timeout)
-            
-            # Check for severe parsing errors
-            if getattr(feed, "bozo", False):
-                exception_type = feed.bozo_exception.__class__.__name__
-                if exception_type not in ('NonXMLContentType', 'CharacterEncodingOverride'):
-                    return False, f"URL {i+1} - Invalid feed format: {feed.bozo_exception}"
-            
-            # Check if feed has entries
-            if not feed.entries:
-                return False, f"URL {i+1} - Feed has no entries or is empty"
-            
-            # Check if feed has basic structure
-            if not hasattr(feed, 'feed'):
-                return False, f"URL {i+1} - Invalid feed structure"
-        
+                return False, f"URL {i+1} must start with http:// or https://", []
+
+        # Fetch every source at once; report the first failing one in URL order
+        source_entries, errors = fetch_sources(urls, timeout, max_entries=max_entries)
+        for i, url, error in sorted(errors, key=lambda item: item[0]):
+            if isinstance(error, (socket.timeout, TimeoutError)) or isinstance(getattr(error, "reason", None), (socket.timeout, TimeoutError)):
+                return False, f"URL {i+1} - Connection timeout - feed took too long to respond", []
+            if isinstance(error, FeedFormatError):
+                return False, f"URL {i+1} - Invalid feed format: {error}", []
+            return False, f"URL {i+1} - Validation error: {error}", []
+
+        for i, entries in enumerate(source_entries):
+            if not entries:
+                return False, f"URL {i+1} - Feed has no entries or is empty", []
+
+        if on_sources is not None:
+            on_sources(source_entries)
+        entries = merge_sources(source_entries, max_entries)
         if len(urls) > 1:
-            return True, f"Valid amalgamated feed ({len(urls)} sources)"
+            return True, f"Valid amalgamated feed ({len(urls)} sources)", entries
         else:
-            return True, "Valid feed"
+            return True, "Valid feed", entries
         
-    except socket.timeout:
-        return False, "Connection timeout - feed took too long to respond"
     except Exception as e:
-        return False, f"Validation error: {str(e)}"
+        return False, f"Validation error: {str(e)}", []
+
+class Article:
+    """
+    Compact record of one feed entry, holding only the fields the app
+    displays. Built once at ingest so the full feedparser entry (content
+    blocks, *_detail structures, ...) can be dropped.
+    """
+    __slots__ = ("title", "link", "guid", "summary", "published", "source_url", "source_domain")
+
+    def __init__(self, title, link, guid, summary, published, source_url=None, source_domain=None):
+        self.title = title
+        self.link = link
+        self.guid = guid
+        self.summary = summary
+        self.published = published
+        self.source_url = source_url
+        self.source_domain = source_domain
+
+    @classmethod
+    def from_entry(cls, entry, source_url=None, source_domain=None):
+        """Build an Article from a feedparser entry."""
+        return cls(
+            entry.get("title", "No Title"),
+            entry.get("link", "#"),
+            entry.get("id") or entry.get("link"),
+            summary_snippet(entry.get("summary", entry.get("description", ""))),
+            get_entry_published_time(entry),
+            source_url,
+            source_domain
+        )
 
 def get_entry_published_time(entry):
     """
-    Extract published time from an entry and convert to timestamp.
-    Tries multiple date fields and returns current time if none found.
+    Extract published time from an entry and convert to a UTC timestamp.
+    Tries multiple date fields; an undated entry gets the time it was first
+    seen, so its position stays stable across refreshes.
     """
+    if isinstance(entry, Article):
+        return entry.published
+
     # Try different date fields in order of preference
     date_fields = ['published_parsed', 'updated_parsed', 'created_parsed']
     
     for field in date_fields:
-        if hasattr(entry, field) and getattr(entry, field):
+        time_struct = entry.get(field)
+        if time_struct:
             try:
-                time_struct = getattr(entry, field)
-                return time.mktime(time_struct)
+                # feedparser normalises dates to UTC struct_time
+                return calendar.timegm(time_struct)
             except (TypeError, ValueError):
                 continue
     
-    # If no valid date found, return current time (will sort to top)
-    return time.time()
+    # If no valid date found, use when it was first seen (sorts to top when new)
+    key = entry.get("id") or entry.get("link") or entry.get("title")
+    if not key:
+        return time.time()
+    with _FIRST_SEEN_LOCK:
+        if key in _FIRST_SEEN:
+            _FIRST_SEEN.move_to_end(key)
+        else:
+            _FIRST_SEEN[key] = time.time()
+            if len(_FIRST_SEEN) > _FIRST_SEEN_LIMIT:
+                _FIRST_SEEN.popitem(last=False)
+        return _FIRST_SEEN[key]
+
+def entry_key(entry):
+    """Identity of an article across refreshes: GUID, else normalized link, else title."""
+    return entry.guid or dedup.normalize_link(entry.link) or entry.title
+
+def diff_entries(old_entries, new_entries):
+    """
+    Compare a refreshed entry list against the cached one.
+    Returns (added, updated, removed): added and removed are lists of
+    articles, updated is a list of (old_article, new_article) pairs whose
+    title, summary or published time changed.
+    """
+    old_by_key = {entry_key(entry): entry for entry in old_entries}
+    new_keys = set()
+    added = []
+    updated = []
+
+    for entry in new_entries:
+        key = entry_key(entry)
+        new_keys.add(key)
+        previous = old_by_key.get(key)
+        if previous is None:
+            added.append(entry)
+        elif (previous.title, previous.summary, previous.published) != (entry.title, entry.summary, entry.published):
+            updated.append((previous, entry))
+
+    removed = [entry for key, entry in old_by_key.items() if key not in new_keys]
+    return added, updated, removed
+
+def merge_entries(old_entries, added, updated, removed, max_entries=100):
+    """
+    Apply a diff_entries delta to a sorted (newest first) entry list.
+    Unchanged articles keep their objects; only the incoming ones are
+    sorted and merged in.
+    """
+    dropped = {id(entry) for entry in removed}
+    dropped.update(id(previous) for previous, _ in updated)
+    kept = [entry for entry in old_entries if id(entry) not in dropped]
+
+    incoming = added + [entry for _, entry in updated]
+    incoming.sort(key=lambda article: article.published, reverse=True)
+
+    merged = heapq.merge(kept, incoming, key=lambda article: article.published, reverse=True)
+    return list(itertools.islice(merged, max_entries))
+
+def summary_snippet(summary_text):
+    """
+    Return the short summary shown under a headline: the first sentence of
+    an entry's summary/description followed by "...".
+    """
+    return (summary_text.split(".")[0] + "...") if summary_text else ""
 
 def extract_domain_from_url(url):
     """
@@ -118,10 +258,223 @@ def extract_domain_from_url(url):
     except Exception:
         return url
 
-def fetch_feed_entries(feed_url, max_entries=100):
+def get_fetch_executor():
+    """
+    Return the shared thread pool used to download feed sources.
+    The pool is created on first use and bounded by config.FEED_FETCH_WORKERS.
+    """
+    global _FETCH_EXECUTOR
+    with _FETCH_EXECUTOR_LOCK:
+        if _FETCH_EXECUTOR is None:
+            _FETCH_EXECUTOR = ThreadPoolExecutor(
+                max_workers=config.FEED_FETCH_WORKERS,
+                thread_name_prefix="feed-fetch"
+            )
+        return _FETCH_EXECUTOR
+
+def download_source(url, timeout, etag=None, modified=None):
+    """
+    Download one feed document through the pooled HTTP client.
+    Returns (status, body, headers) with lowercased header names; a 304
+    Not Modified answer to the conditional headers returns an empty body.
+    """
+    request_headers = {}
+    if etag:
+        request_headers['If-None-Match'] = etag
+    if modified:
+        request_headers['If-Modified-Since'] = modified
+
+    status, body, headers, final_url = http_pool.get(url, request_headers, timeout)
+    # The body is already decompressed; let feedparser resolve relative links
+    headers.pop("content-encoding", None)
+    headers.setdefault("content-location", final_url)
+    return status, body, headers
+
+def fetch_source_entries(url, started=None, index=None, timeout=None, max_entries=100):
+    """
+    Download and parse a single feed source.
+    Returns up to max_entries of the source's newest entries as Article
+    records tagged with their source. Large documents are parsed with the
+    streaming parser, which stops early once enough entries are read;
+    anything it cannot handle goes through feedparser.
+    Uses the stored ETag/Last-Modified validators so an unchanged feed
+    (HTTP 304) reuses the previously parsed entries.
+    Raises FeedFormatError for severe parsing errors and the network error
+    if the download fails or exceeds timeout seconds.
+    """
+    if started is not None:
+        started[index] = time.monotonic()
+    if timeout is None:
+        timeout = config.FEED_FETCH_TIMEOUT
+
+    with _VALIDATORS_LOCK:
+        cached = _VALIDATORS.get(url)
+
+    with perf.span("download", url=url):
+        status, body, headers = download_source(
+            url,
+            timeout,
+            etag=cached["etag"] if cached else None,
+            modified=cached["modified"] if cached else None
+        )
+
+    # Not modified since the last download: nothing to parse
+    if cached and status == 304:
+        with _VALIDATORS_LOCK:
+            info = _SOURCE_INFO.setdefault(url, {"update_hint": None})
+            info["not_modified"] = True
+        return list(cached["entries"])
+
+    with perf.span("parse", url=url, size=len(body)):
+        parsed = None
+        if config.STREAMING_PARSE_ENABLED and len(body) >= config.STREAMING_PARSE_MIN_BYTES:
+            parsed = streamparse.parse_entries(body, max_entries, headers.get("content-location"))
+
+        if parsed is not None:
+            raw_entries, feed_info = parsed
+        else:
+            # Imported on first use: feedparser dominates the app's import time
+            import feedparser
+            feed = feedparser.parse(body, response_headers=headers)
+
+            # Check for severe parsing errors
+            if getattr(feed, "bozo", False):
+                exception_type = feed.bozo_exception.__class__.__name__
+                if exception_type not in ('NonXMLContentType', 'CharacterEncodingOverride'):
+                    raise FeedFormatError(feed.bozo_exception)
+            raw_entries, feed_info = feed.entries, feed.get("feed", {})
+
+    # Extract clean domain name for display
+    domain_name = extract_domain_from_url(url)
+
+    # Keep only the displayed fields, with source info for tracking,
+    # newest first (stable, so undated entries keep document order)
+    with perf.span("sort", url=url):
+        entries = [Article.from_entry(entry, url, domain_name) for entry in raw_entries]
+        entries.sort(key=lambda article: article.published, reverse=True)
+        del entries[max_entries:]
+
+    etag = headers.get("etag")
+    modified = headers.get("last-modified")
+    with _VALIDATORS_LOCK:
+        if etag or modified:
+            _VALIDATORS[url] = {"etag": etag, "modified": modified, "entries": entries}
+        else:
+            _VALIDATORS.pop(url, None)
+        _SOURCE_INFO[url] = {"not_modified": False, "update_hint": get_update_hint(feed_info)}
+    return list(entries)
+
+def get_update_hint(feed_info):
+    """
+    Return the publisher's suggested refresh interval in seconds, from the
+    RSS <ttl> (minutes) or sy:updatePeriod/sy:updateFrequency, or None.
+    """
+    hints = []
+    try:
+        ttl = int(feed_info.get("ttl", 0))
+        if ttl > 0:
+            hints.append(ttl * 60)
+    except (TypeError, ValueError):
+        pass
+
+    period = _UPDATE_PERIODS.get(str(feed_info.get("sy_updateperiod", "")).strip().lower())
+    if period:
+        try:
+            frequency = max(1, int(feed_info.get("sy_updatefrequency", 1)))
+        except (TypeError, ValueError):
+            frequency = 1
+        hints.append(period / frequency)
+
+    return max(hints) if hints else None
+
+def get_feed_hints(feed_url):
+    """
+    Summarise the last download of every source of feed_url.
+    Returns (not_modified, update_hint): not_modified is True only when
+    every source answered 304; update_hint is the longest source hint.
+    """
+    not_modified = True
+    hints = []
+    with _VALIDATORS_LOCK:
+        for url in parse_feed_urls(feed_url):
+            info = _SOURCE_INFO.get(url)
+            if not info:
+                not_modified = False
+                continue
+            not_modified = not_modified and info.get("not_modified", False)
+            if info.get("update_hint"):
+                hints.append(info["update_hint"])
+    return not_modified, (max(hints) if hints else None)
+
+def fetch_sources(urls, timeout=None, cancel_event=None, max_entries=100):
+    """
+    Download and parse urls concurrently on the shared worker pool.
+    Each source's deadline (timeout seconds, default config.FEED_FETCH_TIMEOUT)
+    counts from when a worker actually picks it up, so queued sources are
+    not penalised. Returns (source_entries, errors): one entry list per URL
+    (empty on failure, at most max_entries long) and a list of
+    (index, url, exception).
+    Setting cancel_event abandons the remaining sources and raises FetchCancelled.
+    """
+    if timeout is None:
+        timeout = config.FEED_FETCH_TIMEOUT
+
+    source_entries = [[] for _ in urls]
+    errors = []
+
+    executor = get_fetch_executor()
+    started = {}
+    pending = {
+        executor.submit(fetch_source_entries, url, started, i, timeout, max_entries): (i, url)
+        for i, url in enumerate(urls)
+    }
+
+    while pending:
+        if cancel_event is not None and cancel_event.is_set():
+            for future in pending:
+                future.cancel()
+            raise FetchCancelled("Fetch was cancelled")
+
+        done, _ = wait(pending, timeout=_DEADLINE_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            i, url = pending.pop(future)
+            try:
+                source_entries[i] = future.result()
+            except Exception as e:
+                errors.append((i, url, e))
+
+        # Give up on sources past their deadline but keep everything else
+        now = time.monotonic()
+        for future, (i, url) in list(pending.items()):
+            start = started.get(i)
+            if start is not None and now - start > timeout:
+                future.cancel()
+                del pending[future]
+                errors.append((i, url, TimeoutError(f"timed out after {timeout}s")))
+
+    return source_entries, errors
+
+def merge_sources(source_entries, max_entries=100):
+    """
+    Combine per-source entry lists (each sorted newest first) into one.
+    Uses a k-way merge, drops stories another source already carried and
+    stops after max_entries instead of sorting everything.
+    """
+    with perf.span("merge", sources=len(source_entries)):
+        merged = heapq.merge(*source_entries, key=lambda article: article.published, reverse=True)
+        return list(itertools.islice(dedup.unique(merged), max_entries))
+
+def fetch_feed_entries(feed_url, max_entries=100, timeout=None, cancel_event=None, on_sources=None):
     """
     Fetch feed entries using feedparser. 
     Now supports comma-separated URLs for amalgamation.
+    All sources are downloaded concurrently on a bounded worker pool; a source
+    that exceeds its deadline (timeout seconds, default config.FEED_FETCH_TIMEOUT)
+    is reported as an error while the other sources' entries are kept.
+    Setting cancel_event abandons the remaining sources and raises FetchCancelled.
+    on_sources (if given) is called with every source's own entry list
+    before the merge cuts them to max_entries.
     Returns merged and sorted list of entries.
     """
     # Ensure feed_url is a string, not a list
@@ -136,40 +489,14 @@ def fetch_feed_entries(feed_url, max_entries=100):
     
     if not urls:
         raise Exception("No valid URLs to fetch")
+
+    with perf.span("fetch", sources=len(urls)):
+        source_entries, errors = fetch_sources(urls, timeout, cancel_event, max_entries)
     
-    all_entries = []
-    errors = []
-    
-    # Fetch from each URL
-    for url in urls:
-        try:
-            feed = feedparser.parse(url, request_headers={'User-Agent': 'NewsViewerApp/1.0'})
-            
-            # Check for severe parsing errors
-            if getattr(feed, "bozo", False):
-                exception_type = feed.bozo_exception.__class__.__name__
-                if exception_type not in ('NonXMLContentType', 'CharacterEncodingOverride'):
-                    errors.append(f"{url}: {feed.bozo_exception}")
-                    continue
-            
-            # Extract clean domain name for display
-            domain_name = extract_domain_from_url(url)
-            
-            # Add source info to each entry for tracking
-            for entry in feed.entries:
-                entry._source_url = url
-                entry._source_domain = domain_name
-                all_entries.append(entry)
-                
-        except Exception as e:
-            errors.append(f"{url}: {str(e)}")
-            continue
-    
-    if not all_entries and errors:
-        raise Exception(f"Failed to fetch any feeds. Errors: {'; '.join(errors)}")
-    
-    # Sort all entries by publication time (newest first)
-    all_entries.sort(key=get_entry_published_time, reverse=True)
-    
-    # Return up to max_entries
-    return all_entries[:max_entries]
\ No newline at end of file
+    if not any(source_entries) and errors:
+        messages = [f"{url}: {str(e)}" for _, url, e in errors]
+        raise Exception(f"Failed to fetch any feeds. Errors: {'; '.join(messages)}")
+
+    if on_sources is not None:
+        on_sources(source_entries)
+    return merge_sources(source_entries, max_entries)
\ No newline at end of file
@@ -0,0 +1,93 @@
+import random
+import statistics
+import threading
+import time
+from collections import deque
+
+import config
+
+# Per-feed refresh state: feed_url -> dict (see _new_state)
+_STATE = {}
+_LOCK = threading.Lock()
+
+def _new_state():
+    return {
+        "interval": config.REFRESH_INTERVAL_MS / 1000,
+        "next_due": time.time() + config.REFRESH_INTERVAL_MS / 1000,
+        "errors": 0,
+        "unchanged": deque(maxlen=config.REFRESH_HISTORY_SIZE),
+        "newest_link": None,
+    }
+
+def estimate_cadence(entries):
+    """
+    Estimate how often a feed publishes, in seconds, from the median gap
+    between its most recent entries. Returns None if there is too little data.
+    """
+    stamps = sorted(
+        (entry.published for entry in entries[:config.REFRESH_HISTORY_SIZE + 1]),
+        reverse=True
+    )
+    gaps = [a - b for a, b in zip(stamps, stamps[1:]) if a - b > 0]
+    if len(gaps) < 2:
+        return None
+    return statistics.median(gaps)
+
+def _jittered(seconds):
+    return seconds * random.uniform(1 - config.REFRESH_JITTER, 1 + config.REFRESH_JITTER)
+
+def _clamp(seconds):
+    return min(config.REFRESH_MAX_INTERVAL_S, max(config.REFRESH_MIN_INTERVAL_S, seconds))
+
+def record_success(feed_url, entries, not_modified=False, update_hint=None):
+    """
+    Learn from a successful fetch and schedule the feed's next refresh.
+    The interval follows the observed publish cadence, is never shorter than
+    the publisher's ttl/sy:updatePeriod hint and stretches when recent
+    fetches keep coming back unchanged (HTTP 304 or same newest entry).
+    """
+    with _LOCK:
+        state = _STATE.setdefault(feed_url, _new_state())
+        newest_link = entries[0].link if entries else None
+        state["unchanged"].append(not_modified or (newest_link is not None and newest_link == state["newest_link"]))
+        state["newest_link"] = newest_link
+        state["errors"] = 0
+
+        interval = estimate_cadence(entries) or config.REFRESH_INTERVAL_MS / 1000
+        if update_hint:
+            interval = max(interval, update_hint)
+        unchanged_rate = sum(state["unchanged"]) / len(state["unchanged"])
+        interval *= 1 + unchanged_rate * (config.REFRESH_UNCHANGED_FACTOR - 1)
+
+        state["interval"] = _clamp(interval)
+        state["next_due"] = time.time() + _jittered(state["interval"])
+
+def record_error(feed_url):
+    """Back off exponentially after consecutive failures of feed_url."""
+    with _LOCK:
+        state = _STATE.setdefault(feed_url, _new_state())
+        state["errors"] += 1
+        backoff = state["interval"] * (2 ** min(state["errors"], 10))
+        state["next_due"] = time.time() + _jittered(min(config.REFRESH_MAX_INTERVAL_S, backoff))
+
+def is_backing_off(feed_url, now=None):
+    """True if feed_url's last fetch failed and its backoff has not elapsed yet."""
+    if now is None:
+        now = time.time()
+    with _LOCK:
+        state = _STATE.get(feed_url)
+        return state is not None and state["errors"] > 0 and state["next_due"] > now
+
+def due_feeds(feed_urls, now=None):
+    """Return the feeds among feed_urls whose next refresh is due."""
+    if now is None:
+        now = time.time()
+    with _LOCK:
+        return [url for url in feed_urls if url in _STATE and _STATE[url]["next_due"] <= now]
+
+def postpone(feed_url):
+    """Push a feed's next check out by its interval, e.g. while a fetch is running."""
+    with _LOCK:
+        state = _STATE.get(feed_url)
+        if state:
+            state["next_due"] = time.time() + _jittered(state["interval"])
\ No newline at end of file
@@ -0,0 +1,114 @@
+from collections import defaultdict
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def searchable_text(entry):
+    """The text a search matches against: the headline and the displayed summary."""
+    return f"{entry.title}\n{entry.summary}".lower()
+
+class SearchIndex:
+    """Trigram inverted index over the cached articles of every feed."""
+
+    def __init__(self):
+        # doc id -> (feed_url, entry, lowercased text, published timestamp)
+        self._docs = {}
+        # feed_url -> {id(entry): doc id}; entries stay alive in _docs
+        self._feed_docs = {}
+        self._postings = defaultdict(set)
+        self._next_doc_id = 0
+        # Bumped on every index change; invalidates the cached last result
+        self._version = 0
+        self._last_result = (None, None, [])
+
+    @property
+    def version(self):
+        """Changes whenever the indexed entries do; for caching search results."""
+        return self._version
+
+    def _remove_doc(self, doc_id):
+        _, _, text, _ = self._docs.pop(doc_id)
+        for gram in _trigrams(text):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def _add_doc(self, feed_url, entry):
+        doc_id = self._next_doc_id
+        self._next_doc_id += 1
+        text = searchable_text(entry)
+        self._docs[doc_id] = (feed_url, entry, text, entry.published)
+        for gram in _trigrams(text):
+            self._postings[gram].add(doc_id)
+        return doc_id
+
+    def remove_feed(self, feed_url):
+        """Drop every indexed article of feed_url."""
+        for doc_id in self._feed_docs.pop(feed_url, {}).values():
+            self._remove_doc(doc_id)
+        self._version += 1
+
+    def index_feed(self, feed_url, entries):
+        """
+        Make the index match the cached entries of feed_url. Articles already
+        indexed for the feed (same object) are kept; only new ones are
+        tokenised and only vanished ones are removed.
+        """
+        old_docs = self._feed_docs.get(feed_url, {})
+        new_docs = {}
+        for entry in entries:
+            doc_id = old_docs.get(id(entry))
+            if doc_id is None:
+                doc_id = self._add_doc(feed_url, entry)
+            new_docs[id(entry)] = doc_id
+
+        for entry_id, doc_id in old_docs.items():
+            if entry_id not in new_docs:
+                self._remove_doc(doc_id)
+
+        self._feed_docs[feed_url] = new_docs
+        self._version += 1
+
+    def search(self, term):
+        """
+        Return every indexed entry whose headline or summary contains term
+        (case-insensitive), newest first, with duplicate links collapsed.
+        """
+        term = term.strip().lower()
+        if not term:
+            return []
+
+        last_term, last_version, last_result = self._last_result
+        if last_term == term and last_version == self._version:
+            return last_result
+
+        grams = _trigrams(term)
+        if grams:
+            # Intersect the rarest posting lists first
+            postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates &= posting
+        else:
+            # One or two characters: too short for trigrams, scan everything
+            candidates = self._docs.keys()
+
+        matches = [self._docs[doc_id] for doc_id in candidates if term in self._docs[doc_id][2]]
+        matches.sort(key=lambda doc: doc[3], reverse=True)
+
+        result = []
+        seen_links = set()
+        for _, entry, _, _ in matches:
+            link = entry.link
+            if link:
+                if link in seen_links:
+                    continue
+                seen_links.add(link)
+            result.append(entry)
+
+        self._last_result = (term, self._version, result)
+        return result
\ No newline at end of file
@@ -0,0 +1,250 @@
+import asyncio
+import hashlib
+import json
+import time
+from urllib.parse import urlsplit, parse_qs, unquote
+
+import config
+import engine
+import rss
+
+_MAX_HEADER_BYTES = 16 * 1024
+_REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+class FeedServer:
+    """
+    Serve the saved lists and their merged, paginated entries as JSON.
+    Pages are precomputed into memory after every refresh cycle, so a
+    request is a dictionary lookup; responses carry an ETag and honour
+    If-None-Match.
+    """
+
+    def __init__(self, feed_engine=None):
+        self.engine = feed_engine or engine.FeedEngine()
+        # path -> (etag, body); replaced wholesale after each rebuild
+        self.pages = {}
+        self._search_cache = {}
+
+    # -- Data -------------------------------------------------------------
+
+    def all_feed_urls(self):
+        urls = []
+        for feeds in config.SAVED_LISTS.values():
+            for name, url, row in feeds:
+                if url not in urls:
+                    urls.append(url)
+        return urls
+
+    def _refresh(self, feed_url):
+        try:
+            return self.engine.refresh(feed_url)
+        except Exception:
+            return False
+
+    async def refresh_all(self):
+        """Fetch every feed once, concurrently on the default executor."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(None, self._refresh, url) for url in self.all_feed_urls()
+        ))
+
+    @staticmethod
+    def _article_json(article):
+        return {
+            "title": article.title,
+            "link": article.link,
+            "summary": article.summary,
+            "published": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(article.published)),
+            "source": article.source_domain,
+        }
+
+    def _page_documents(self, base_path, entries, extra):
+        """Yield (path, document) for every page of entries under base_path."""
+        per_page = config.ARTICLES_PER_PAGE
+        total_pages = max(1, (len(entries) + per_page - 1) // per_page)
+        for page_number in range(1, total_pages + 1):
+            page_entries, _, _ = self.engine.paginate(entries, page_number, per_page)
+            document = dict(extra)
+            document.update({
+                "page": page_number,
+                "total_pages": total_pages,
+                "total_entries": len(entries),
+                "entries": [self._article_json(article) for article in page_entries],
+            })
+            yield f"{base_path}?page={page_number}", document
+
+    def build_pages(self):
+        """Precompute every response body; returns the new path -> (etag, body) map."""
+        documents = {}
+        summary = []
+        for list_name, feeds in config.SAVED_LISTS.items():
+            summary.append({"name": list_name, "feeds": len(feeds)})
+            list_path = f"/lists/{list_name}"
+            documents[list_path] = {
+                "name": list_name,
+                "feeds": [{"index": i, "name": name, "url": url, "row": row} for i, (name, url, row) in enumerate(feeds)],
+            }
+
+            merged = rss.merge_sources(
+                [self.engine.entries(url) for name, url, row in feeds],
+                config.SERVER_MAX_LIST_ENTRIES
+            )
+            documents.update(self._page_documents(f"{list_path}/entries", merged, {"list": list_name}))
+
+            for i, (name, url, row) in enumerate(feeds):
+                documents.update(self._page_documents(
+                    f"{list_path}/feeds/{i}/entries",
+                    self.engine.entries(url),
+                    {"list": list_name, "feed": name}
+                ))
+        documents["/lists"] = {"lists": summary}
+
+        return {path: self._encode(document) for path, document in documents.items()}
+
+    @staticmethod
+    def _encode(document):
+        body = json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return '"' + hashlib.sha1(body).hexdigest() + '"', body
+
+    def _encode_search_page(self, term, page_number):
+        entries = self.engine.query(term)
+        page_entries, page_number, total_pages = self.engine.paginate(entries, page_number)
+        return self._encode({
+            "query": term,
+            "page": page_number,
+            "total_pages": total_pages,
+            "total_entries": len(entries),
+            "entries": [self._article_json(article) for article in page_entries],
+        })
+
+    async def search_page(self, term, page_number):
+        key = (term, page_number, self.engine.version)
+        cached = self._search_cache.get(key)
+        if cached is None:
+            # The query takes the engine lock and may scan every cached feed;
+            # keep it off the event loop so other connections are not stalled
+            loop = asyncio.get_running_loop()
+            cached = await loop.run_in_executor(None, self._encode_search_page, term, page_number)
+            if len(self._search_cache) >= config.SERVER_SEARCH_CACHE_SIZE:
+                self._search_cache.clear()
+            self._search_cache[key] = cached
+        return cached
+
+    # -- HTTP -------------------------------------------------------------
+
+    async def route(self, target):
+        """Return (status, etag, body) for a request target."""
+        parts = urlsplit(target)
+        path = unquote(parts.path).rstrip("/") or "/"
+        query = parse_qs(parts.query)
+
+        # Only search results and entry lists are paginated
+        page_number = None
+        if path == "/search" or path.endswith("/entries"):
+            try:
+                page_number = int(query.get("page", ["1"])[0])
+            except ValueError:
+                return 400, None, b'{"error":"page must be an integer"}'
+
+        if path == "/search":
+            term = query.get("q", [""])[0].strip()
+            if not term:
+                return 400, None, b'{"error":"missing q"}'
+            etag, body = await self.search_page(term, page_number)
+            return 200, etag, body
+
+        if page_number is not None:
+            path = f"{path}?page={page_number}"
+        page = self.pages.get(path)
+        if page is None:
+            return 404, None, b'{"error":"not found"}'
+        etag, body = page
+        return 200, etag, body
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    # Idle keep-alive clients are dropped instead of holding a socket
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), config.SERVER_KEEPALIVE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                try:
+                    method, target, version = lines[0].split(" ", 2)
+                except ValueError:
+                    await self._respond(writer, 400, None, b'{"error":"bad request"}', False)
+                    break
+                headers = {}
+                for line in lines[1:]:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                if method not in ("GET", "HEAD"):
+                    status, etag, body = 405, None, b'{"error":"method not allowed"}'
+                else:
+                    status, etag, body = await self.route(target)
+                    if status == 200 and etag and headers.get("if-none-match") == etag:
+                        status, body = 304, b""
+
+                await self._respond(writer, status, etag, b"" if method == "HEAD" else body, keep_alive, len(body))
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _respond(writer, status, etag, body, keep_alive, length=None):
+        head = [
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body) if length is None else length}",
+            "Connection: " + ("keep-alive" if keep_alive else "close"),
+        ]
+        if etag:
+            head.append(f"ETag: {etag}")
+            head.append("Cache-Control: no-cache")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    # -- Lifecycle --------------------------------------------------------
+
+    async def refresh_loop(self):
+        """Refresh due feeds in the background and rebuild pages when something changed."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(config.REFRESH_CHECK_INTERVAL_MS / 1000)
+            changed = await loop.run_in_executor(None, self.engine.refresh_due, self.all_feed_urls())
+            if changed:
+                self.pages = await loop.run_in_executor(None, self.build_pages)
+
+    async def serve(self, host, port):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, lambda: [self.engine.load_cached(url) for url in self.all_feed_urls()])
+        self.pages = await loop.run_in_executor(None, self.build_pages)
+
+        server = await asyncio.start_server(self.handle_client, host, port, limit=_MAX_HEADER_BYTES, backlog=1024)
+        print(f"Serving {len(config.SAVED_LISTS)} lists on http://{host}:{port}/lists")
+
+        async def initial_fetch():
+            await self.refresh_all()
+            self.pages = await loop.run_in_executor(None, self.build_pages)
+
+        background = [asyncio.create_task(initial_fetch()), asyncio.create_task(self.refresh_loop())]
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in background:
+                task.cancel()
+
+def run(host=None, port=None):
+    """Load the saved lists and serve them until interrupted."""
+    config.load_config()
+    try:
+        asyncio.run(FeedServer().serve(host or config.SERVER_HOST, port or config.SERVER_PORT))
+    except KeyboardInterrupt:
+        pass
\ No newline at end of file
@@ -0,0 +1,162 @@
+import mmap
+import os
+import struct
+
+import rss
+
+# Snapshot file layout (little-endian):
+#   header   magic, version, source count, entry count and the offsets below
+#   strings  UTF-8 text; each entry's fields are one length-prefixed blob
+#   sources  fixed-width (url offset, domain offset, url length, domain length)
+#   index    fixed-width (published, source id, blob length, blob offset), newest first
+MAGIC = b"NFSNAP01"
+VERSION = 1
+URL_PREFIX = "snapshot:"
+
+_HEADER = struct.Struct("<8sIIQQQQ")
+_SOURCE = struct.Struct("<QQII")
+_INDEX = struct.Struct("<dIIQ")
+_FIELDS = struct.Struct("<IIII")
+_NO_SOURCE = 0xFFFFFFFF
+
+class SnapshotFormatError(Exception):
+    pass
+
+def export(path, entries):
+    """
+    Write entries (newest first) to a snapshot file at path, atomically.
+    Returns the number of entries written.
+    """
+    strings = bytearray()
+    sources = {}
+    source_records = []
+    index = bytearray()
+
+    def add_string(text):
+        data = (text or "").encode("utf-8")
+        offset = len(strings)
+        strings.extend(data)
+        return offset, len(data)
+
+    count = 0
+    for entry in entries:
+        source_key = (entry.source_url, entry.source_domain)
+        if entry.source_url is None and entry.source_domain is None:
+            source_id = _NO_SOURCE
+        elif source_key in sources:
+            source_id = sources[source_key]
+        else:
+            source_id = sources[source_key] = len(source_records)
+            url_offset, url_length = add_string(entry.source_url)
+            domain_offset, domain_length = add_string(entry.source_domain)
+            source_records.append(_SOURCE.pack(url_offset, domain_offset, url_length, domain_length))
+
+        fields = [(value or "").encode("utf-8") for value in (entry.title, entry.link, entry.guid, entry.summary)]
+        blob_offset = len(strings)
+        strings.extend(_FIELDS.pack(*(len(field) for field in fields)))
+        for field in fields:
+            strings.extend(field)
+        index.extend(_INDEX.pack(entry.published or 0.0, source_id, len(strings) - blob_offset, blob_offset))
+        count += 1
+
+    strings_offset = _HEADER.size
+    sources_offset = strings_offset + len(strings)
+    index_offset = sources_offset + len(source_records) * _SOURCE.size
+    header = _HEADER.pack(MAGIC, VERSION, len(source_records), count, strings_offset, sources_offset, index_offset)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(header)
+        f.write(strings)
+        f.writelines(source_records)
+        f.write(index)
+    os.replace(temp_path, path)
+    return count
+
+class Snapshot:
+    """
+    Read-only, memory-mapped view of a snapshot file. Behaves like a list of
+    rss.Article (len, indexing, slicing) but only decodes the entries that
+    are accessed, so paging through a large archive stays cheap.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise SnapshotFormatError(f"{path} is empty")
+
+        try:
+            self._read_tables()
+        except SnapshotFormatError:
+            self.close()
+            raise
+        except (struct.error, UnicodeDecodeError) as e:
+            self.close()
+            raise SnapshotFormatError(f"{path} is not a snapshot file ({e})")
+
+    def _read_tables(self):
+        """Check the header and table bounds against the file and decode the sources."""
+        magic, version, source_count, self._count, self._strings, sources_offset, self._index = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotFormatError(f"{self.path} is not a snapshot file (or a newer version)")
+        size = len(self._map)
+        if not (_HEADER.size <= self._strings <= sources_offset
+                and sources_offset + source_count * _SOURCE.size <= self._index
+                and self._index + self._count * _INDEX.size <= size):
+            raise SnapshotFormatError(f"{self.path} is truncated or corrupt")
+        self._strings_size = sources_offset - self._strings
+
+        # Sources are few; decode them once
+        self._sources = []
+        for i in range(source_count):
+            url_offset, domain_offset, url_length, domain_length = _SOURCE.unpack_from(self._map, sources_offset + i * _SOURCE.size)
+            self._sources.append((self._text(url_offset, url_length) or None, self._text(domain_offset, domain_length) or None))
+
+    def _text(self, offset, length):
+        if offset + length > self._strings_size:
+            raise SnapshotFormatError(f"{self.path} is corrupt (text outside the string table)")
+        start = self._strings + offset
+        return self._map[start:start + length].decode("utf-8")
+
+    def __len__(self):
+        return self._count
+
+    def _article(self, i):
+        published, source_id, blob_length, blob_offset = _INDEX.unpack_from(self._map, self._index + i * _INDEX.size)
+        start = self._strings + blob_offset
+        blob = self._map[start:start + blob_length] if blob_offset + blob_length <= self._strings_size else b""
+        lengths = _FIELDS.unpack_from(blob) if len(blob) >= _FIELDS.size else ()
+        if (len(blob) != blob_length or _FIELDS.size + sum(lengths) != blob_length
+                or (source_id != _NO_SOURCE and source_id >= len(self._sources))):
+            raise SnapshotFormatError(f"{self.path} is corrupt (entry {i})")
+
+        fields = []
+        offset = _FIELDS.size
+        try:
+            for length in lengths:
+                fields.append(blob[offset:offset + length].decode("utf-8"))
+                offset += length
+        except UnicodeDecodeError:
+            raise SnapshotFormatError(f"{self.path} is corrupt (entry {i})")
+        title, link, guid, summary = fields
+        source_url, source_domain = self._sources[source_id] if source_id != _NO_SOURCE else (None, None)
+        return rss.Article(title, link, guid or None, summary, published, source_url, source_domain)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self._article(i) for i in range(*key.indices(self._count))]
+        if key < 0:
+            key += self._count
+        if not 0 <= key < self._count:
+            raise IndexError("snapshot index out of range")
+        return self._article(key)
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
\ No newline at end of file
@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import time
+
+import config
+import rss
+
+_WRITE_LOCK = threading.Lock()
+
+_SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    feed_url TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    title TEXT,
+    link TEXT,
+    guid TEXT,
+    summary TEXT,
+    published REAL,
+    source_url TEXT,
+    source_domain TEXT,
+    PRIMARY KEY (feed_url, position)
+);
+CREATE TABLE IF NOT EXISTS feeds (
+    feed_url TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS feeds_fetched_at ON feeds (fetched_at);
+"""
+
+def _connect():
+    """Open a connection to the article store, creating the schema if needed."""
+    conn = sqlite3.connect(config.ARTICLE_STORE_FILE, timeout=5)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != _SCHEMA_VERSION:
+        # The store is only a cache: rebuild it when the layout changes
+        conn.executescript("DROP TABLE IF EXISTS articles; DROP TABLE IF EXISTS feeds;")
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+    conn.executescript(_SCHEMA)
+    return conn
+
+def save_entries(feed_url, entries):
+    """
+    Replace the stored entries of feed_url with entries (kept in order).
+    Safe to call from background threads. Returns True on success.
+    """
+    rows = []
+    for position, entry in enumerate(entries[:config.ARTICLE_STORE_MAX_PER_FEED]):
+        rows.append((
+            feed_url,
+            position,
+            entry.title,
+            entry.link,
+            entry.guid,
+            entry.summary,
+            entry.published,
+            entry.source_url,
+            entry.source_domain,
+        ))
+
+    try:
+        with _WRITE_LOCK:
+            conn = _connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM articles WHERE feed_url = ?", (feed_url,))
+                    conn.executemany("INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                    conn.execute("INSERT OR REPLACE INTO feeds VALUES (?, ?)", (feed_url, time.time()))
+                    _evict(conn)
+            finally:
+                conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+def load_entries(feed_url):
+    """
+    Return the last stored entries of feed_url (newest first) as Article
+    records, or [] if none.
+    """
+    try:
+        conn = _connect()
+        try:
+            rows = conn.execute(
+                "SELECT title, link, guid, summary, published, source_url, source_domain "
+                "FROM articles WHERE feed_url = ? ORDER BY position",
+                (feed_url,)
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return []
+
+    return [rss.Article(*row) for row in rows]
+
+def _evict(conn):
+    """Drop feeds not fetched within the age limit, then the oldest beyond the feed limit."""
+    cutoff = time.time() - config.ARTICLE_STORE_MAX_AGE_DAYS * 86400
+    stale = conn.execute("SELECT feed_url FROM feeds WHERE fetched_at < ?", (cutoff,)).fetchall()
+    overflow = conn.execute(
+        "SELECT feed_url FROM feeds ORDER BY fetched_at DESC LIMIT -1 OFFSET ?",
+        (config.ARTICLE_STORE_MAX_FEEDS,)
+    ).fetchall()
+
+    for (feed_url,) in set(stale + overflow):
+        conn.execute("DELETE FROM articles WHERE feed_url = ?", (feed_url,))
+        conn.execute("DELETE FROM feeds WHERE feed_url = ?", (feed_url,))
\ No newline at end of file
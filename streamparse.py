@@ -0,0 +1,151 @@
+import calendar
+import heapq
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_tz, mktime_tz
+from urllib.parse import urljoin
+
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_RSS1 = "{http://purl.org/rss/1.0/}"
+_RDF = "{http://www.w3.org/1999/02/22-rdf-syntax-ns#}"
+_DC = "{http://purl.org/dc/elements/1.1/}"
+_CONTENT = "{http://purl.org/rss/1.0/modules/content/}"
+_SY = "{http://purl.org/rss/1.0/modules/syndication/}"
+
+_ROOT_TAGS = ("rss", _ATOM + "feed", _RDF + "RDF")
+_ITEM_TAGS = ("item", _RSS1 + "item", _ATOM + "entry")
+
+# Channel-level refresh hints, under the names feedparser uses
+_HINT_TAGS = {
+    "ttl": "ttl",
+    _SY + "updatePeriod": "sy_updateperiod",
+    _SY + "updateFrequency": "sy_updatefrequency",
+}
+
+_CHUNK_SIZE = 64 * 1024
+
+def _text(elem, *tags):
+    for tag in tags:
+        child = elem.find(tag)
+        if child is not None and child.text and child.text.strip():
+            return child.text.strip()
+    return None
+
+def _parse_date(value):
+    """Parse an RFC 822 or ISO 8601 date into a UTC struct_time, or None."""
+    if not value:
+        return None
+    parsed = parsedate_tz(value)
+    if parsed:
+        try:
+            return time.gmtime(mktime_tz(parsed))
+        except (OverflowError, ValueError):
+            return None
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).timetuple()
+
+def _atom_link(elem):
+    for link in elem.findall(_ATOM + "link"):
+        if link.get("rel", "alternate") == "alternate" and link.get("href"):
+            return link.get("href")
+    return None
+
+def _entry_from_element(elem, base_url):
+    """Extract the fields Article.from_entry needs into a plain dict."""
+    if elem.tag == _ATOM + "entry":
+        link = _atom_link(elem)
+        entry = {
+            "title": _text(elem, _ATOM + "title"),
+            "id": _text(elem, _ATOM + "id"),
+            "summary": _text(elem, _ATOM + "summary", _ATOM + "content"),
+            "published_parsed": _parse_date(_text(elem, _ATOM + "published")),
+            "updated_parsed": _parse_date(_text(elem, _ATOM + "updated")),
+        }
+    else:
+        link = _text(elem, "link", _RSS1 + "link")
+        entry = {
+            "title": _text(elem, "title", _RSS1 + "title", _DC + "title"),
+            "id": _text(elem, "guid") or elem.get(_RDF + "about"),
+            "summary": _text(elem, "description", _RSS1 + "description", _CONTENT + "encoded"),
+            "published_parsed": _parse_date(_text(elem, "pubDate", _DC + "date")),
+        }
+
+    if link:
+        entry["link"] = urljoin(base_url, link) if base_url else link
+    # Drop missing fields so entry.get(name, default) falls back as with feedparser
+    return {key: value for key, value in entry.items() if value is not None}
+
+def parse_entries(body, max_entries, base_url=None):
+    """
+    Incrementally parse an RSS 2.0, RSS 1.0 or Atom document.
+    Items are converted as soon as their end tag is read and then detached
+    from the tree, so memory stays bounded by max_entries rather than by
+    document size. While the document is in newest-first order, parsing
+    stops as soon as max_entries entries are collected; otherwise only the
+    max_entries newest are kept.
+    Returns (entries, channel_info) with feedparser-style entry dicts
+    (newest first), or None if the document is malformed or not a feed,
+    so the caller can fall back to feedparser.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    kept = []  # min-heap of (timestamp, -sequence, entry)
+    channel = {}
+    stack = []
+    item_depth = 0
+    sequence = 0
+    newest_first = True
+    previous = None
+
+    try:
+        for offset in range(0, len(body), _CHUNK_SIZE):
+            parser.feed(body[offset:offset + _CHUNK_SIZE])
+            for event, elem in parser.read_events():
+                if event == "start":
+                    if not stack and elem.tag not in _ROOT_TAGS:
+                        return None
+                    stack.append(elem)
+                    if elem.tag in _ITEM_TAGS:
+                        item_depth += 1
+                    continue
+
+                stack.pop()
+                if elem.tag in _ITEM_TAGS:
+                    item_depth -= 1
+                    entry = _entry_from_element(elem, base_url)
+                    if stack:
+                        stack[-1].remove(elem)
+
+                    date = entry.get("published_parsed") or entry.get("updated_parsed")
+                    # Undated entries are always kept (they get a first-seen time later)
+                    stamp = calendar.timegm(date) if date else float("inf")
+                    if date:
+                        if previous is not None and stamp > previous:
+                            newest_first = False
+                        previous = stamp
+
+                    sequence += 1
+                    item = (stamp, -sequence, entry)
+                    if len(kept) < max_entries:
+                        heapq.heappush(kept, item)
+                    elif item > kept[0]:
+                        heapq.heapreplace(kept, item)
+
+                    if len(kept) >= max_entries and newest_first:
+                        return _finish(kept, channel)
+                elif item_depth == 0 and elem.tag in _HINT_TAGS and elem.text:
+                    channel[_HINT_TAGS[elem.tag]] = elem.text.strip()
+        parser.close()
+    except ET.ParseError:
+        return None
+
+    return _finish(kept, channel)
+
+def _finish(kept, channel):
+    kept.sort(reverse=True)
+    return [entry for _, _, entry in kept], channel
\ No newline at end of file
@@ -0,0 +1,111 @@
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import config
+
+# Background worker pool and the queue that carries results back to Tk
+_EXECUTOR = None
+_RESULTS = queue.Queue()
+
+# Latest task per slot: slot name -> (task_id, future, cancel_event)
+_SLOTS = {}
+_SLOTS_LOCK = threading.Lock()
+_TASK_IDS = iter(range(1, 2**63))
+
+_POLLING = False
+
+def get_executor():
+    """Return the shared background executor, creating it on first use."""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(
+            max_workers=config.BACKGROUND_WORKERS,
+            thread_name_prefix="background"
+        )
+    return _EXECUTOR
+
+def _run(task_id, slot, func, cancel_event, on_success, on_error):
+    """Worker-side wrapper: run func and queue its outcome for the Tk thread."""
+    if cancel_event.is_set():
+        return
+    try:
+        result = func(cancel_event)
+    except Exception as e:
+        _RESULTS.put((task_id, slot, cancel_event, on_error, e))
+    else:
+        _RESULTS.put((task_id, slot, cancel_event, on_success, result))
+
+def submit(func, on_success=None, on_error=None, slot=None):
+    """
+    Run func(cancel_event) on a background thread.
+    on_success(result) / on_error(exception) are called later on the Tk thread.
+    Submitting to a slot supersedes the previous task in that slot: it is
+    cancelled and its result is discarded even if it already finished.
+    """
+    task_id = next(_TASK_IDS)
+    cancel_event = threading.Event()
+
+    with _SLOTS_LOCK:
+        if slot is not None:
+            _cancel_slot_locked(slot)
+        future = get_executor().submit(_run, task_id, slot, func, cancel_event, on_success, on_error)
+        if slot is not None:
+            _SLOTS[slot] = (task_id, future, cancel_event)
+    return task_id
+
+def _cancel_slot_locked(slot):
+    previous = _SLOTS.pop(slot, None)
+    if previous:
+        _, future, cancel_event = previous
+        cancel_event.set()
+        future.cancel()
+
+def cancel(slot):
+    """Cancel whatever task currently occupies slot."""
+    with _SLOTS_LOCK:
+        _cancel_slot_locked(slot)
+
+def is_busy(slot):
+    """Return True while a task in slot has not delivered its result yet."""
+    with _SLOTS_LOCK:
+        return slot in _SLOTS
+
+def call_soon(callback, value):
+    """Queue callback(value) to run on the Tk thread; safe from any thread."""
+    _RESULTS.put((None, None, threading.Event(), callback, value))
+
+def poll_results():
+    """Deliver finished task results on the Tk thread, then reschedule."""
+    while True:
+        try:
+            task_id, slot, cancel_event, callback, value = _RESULTS.get_nowait()
+        except queue.Empty:
+            break
+
+        if slot is not None:
+            with _SLOTS_LOCK:
+                current = _SLOTS.get(slot)
+                if not current or current[0] != task_id:
+                    continue  # Superseded by a newer task in this slot
+                del _SLOTS[slot]
+        if cancel_event.is_set():
+            continue
+
+        if callback:
+            try:
+                callback(value)
+            except Exception:
+                if config.ROOT:
+                    config.ROOT.report_callback_exception(*sys.exc_info())
+
+    if config.ROOT:
+        config.ROOT.after(config.TASK_POLL_INTERVAL_MS, poll_results)
+
+def start_polling():
+    """Start the ROOT.after loop that drains the result queue (idempotent)."""
+    global _POLLING
+    if not _POLLING and config.ROOT:
+        _POLLING = True
+        config.ROOT.after(config.TASK_POLL_INTERVAL_MS, poll_results)
\ No newline at end of file
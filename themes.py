@@ -1,6 +1,7 @@
 import tkinter as tk
 import tkinter.ttk as ttk
 import config
+import perf
 
 THEMES = {
     "light": {
@@ -79,41 +80,87 @@ def configure_ttk_theme(current_theme_name):
     style.configure("TSeparator", background=theme["separator_bg"])
     style.configure("Vertical.TScrollbar", background=theme["frame_bg"], troughcolor=theme["bg"])
 
-def apply_theme_to_widget(widget, current_theme_name):
-    theme = THEMES[current_theme_name]
-    widget_class = widget.winfo_class()
+# Tk option -> theme key for each classic Tk widget class (ttk widgets use styles)
+_CLASS_COLORS = {
+    "Frame": {"bg": "frame_bg"},
+    "Labelframe": {"bg": "frame_bg"},
+    "Label": {"bg": "frame_bg", "fg": "fg"},
+    "Canvas": {"bg": "canvas_bg"},
+    # activestyle='none' removes the underline on selected items
+    "Listbox": {"bg": "listbox_bg", "fg": "listbox_fg", "selectbackground": "button_active_bg", "selectforeground": "fg"},
+    "Text": {"bg": "entry_bg", "fg": "entry_fg", "insertbackground": "fg"},
+    "Entry": {"bg": "entry_bg", "fg": "entry_fg", "insertbackground": "fg"},
+    "Button": {"bg": "button_bg", "fg": "button_fg", "activebackground": "button_active_bg", "activeforeground": "button_fg"},
+    "Menu": {"bg": "menu_bg", "fg": "menu_fg", "activebackground": "menu_active_bg", "activeforeground": "menu_fg"},
+}
+_CLASS_FIXED = {
+    "Canvas": {"highlightthickness": 0},
+    "Listbox": {"activestyle": "none"},
+}
+
+# Widget path -> (widget, {option: theme key}) of every live themed widget, so
+# a theme switch recolours exactly these instead of walking the widget tree
+_THEMED = {}
+
+def _register(widget, colors):
+    _THEMED[str(widget)] = (widget, colors)
+    # Destroyed widgets (rebuilt article rows, closed dialogs) leave the registry
+    widget.bind("<Destroy>", _forget, add="+")
+
+def _forget(event):
+    _THEMED.pop(str(event.widget), None)
+
+def _configure(widget, colors, theme):
     try:
-        if widget_class in ("Frame", "Labelframe"):
-            widget.configure(bg=theme["frame_bg"])
-        elif widget_class == "Label":
-            widget.configure(bg=theme["frame_bg"], fg=theme["fg"])
-        elif widget_class == "Canvas":
-            widget.configure(bg=theme["canvas_bg"], highlightthickness=0)
-        elif widget_class == "Listbox":
-            # activestyle='none' removes the underline on selected items
-            widget.configure(bg=theme["listbox_bg"], fg=theme["listbox_fg"],
-                             selectbackground=theme["button_active_bg"], selectforeground=theme["fg"],
-                             activestyle='none')
-        elif widget_class == "Text":
-            widget.configure(bg=theme["entry_bg"], fg=theme["entry_fg"], insertbackground=theme["fg"])
-        elif widget_class == "Entry":
-            widget.configure(bg=theme["entry_bg"], fg=theme["entry_fg"], insertbackground=theme["fg"])
-        elif widget_class == "Button":
-            widget.configure(bg=theme["button_bg"], fg=theme["button_fg"],
-                             activebackground=theme["button_active_bg"], activeforeground=theme["button_fg"])
-        elif widget_class == "Menu":
-            widget.configure(bg=theme["menu_bg"], fg=theme["menu_fg"],
-                             activebackground=theme["menu_active_bg"], activeforeground=theme["menu_fg"])
+        widget.configure(**{option: theme[key] for option, key in colors.items()})
     except Exception:
         pass
-    for child in widget.winfo_children():
-        apply_theme_to_widget(child, current_theme_name)
+
+def apply_theme_to_widget(widget, current_theme_name):
+    """
+    Theme a newly built widget and its descendants once, and register them
+    so apply_theme can recolour them later without another walk.
+    """
+    with perf.span("apply_theme"):
+        theme = THEMES[current_theme_name]
+        pending = [widget]
+        while pending:
+            current = pending.pop()
+            pending.extend(current.winfo_children())
+            path = str(current)
+            if path in _THEMED and _THEMED[path][0] is current:
+                continue
+            widget_class = current.winfo_class()
+            colors = _CLASS_COLORS.get(widget_class)
+            if colors is None:
+                continue
+            fixed = _CLASS_FIXED.get(widget_class)
+            if fixed:
+                try:
+                    current.configure(**fixed)
+                except Exception:
+                    pass
+            _configure(current, colors, theme)
+            _register(current, colors)
 
 def apply_theme(root, current_theme_name):
+    """
+    Theme the main window. The first call walks and registers the widget
+    tree; later calls (theme switches) only recolour registered widgets.
+    """
     configure_ttk_theme(current_theme_name)
     theme = THEMES[current_theme_name]
-    try:
-        root.configure(bg=theme["bg"])
-    except Exception:
-        pass
-    apply_theme_to_widget(root, current_theme_name)
\ No newline at end of file
+
+    path = str(root)
+    if path not in _THEMED:
+        _register(root, {"bg": "bg"})
+        _configure(root, {"bg": "bg"}, theme)
+        apply_theme_to_widget(root, current_theme_name)
+        return
+
+    with perf.span("apply_theme"):
+        for path, (widget, colors) in list(_THEMED.items()):
+            if widget.winfo_exists():
+                _configure(widget, colors, theme)
+            else:
+                del _THEMED[path]
\ No newline at end of file
@@ -1,13 +1,23 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
-import webbrowser
-import time
+from tkinter import ttk, messagebox, filedialog
+import os
 
 import config
 import themes
-import rss
+import perf
+import prefetch
+import scheduler
+import tasks
 import utils
-import dialogs
+
+# archive, engine, rss (with http_pool) and snapshot are imported inside the
+# functions that use them, after the window is painted: together they are
+# most of this module's import time
+
+SEARCH_PLACEHOLDER = "Search..."
+_SEARCH_AFTER_ID = None
+# Read-only views (imported snapshots, history ranges) -> their display name
+_READ_ONLY_VIEWS = {}
 
 def enable_mouse_wheel(canvas):
     def _on_mouse_wheel(event):
@@ -19,197 +29,451 @@ def enable_mouse_wheel(canvas):
     canvas.bind_all("<Button-5>", _on_mouse_wheel)
     canvas.bind_all("<MouseWheel>", _on_mouse_wheel)
 
+def get_search_term():
+    """Current search box text, ignoring the "Search..." placeholder."""
+    if config.SEARCH_TERM is None:
+        return ""
+    term = config.SEARCH_TERM.get().strip()
+    return "" if term == SEARCH_PLACEHOLDER else term
+
+def schedule_search():
+    """Debounce search input: re-render once typing pauses for SEARCH_DEBOUNCE_MS."""
+    global _SEARCH_AFTER_ID
+    if _SEARCH_AFTER_ID is not None:
+        config.ROOT.after_cancel(_SEARCH_AFTER_ID)
+    _SEARCH_AFTER_ID = config.ROOT.after(config.SEARCH_DEBOUNCE_MS, run_search)
+
+def run_search():
+    import archive
+    global _SEARCH_AFTER_ID
+    _SEARCH_AFTER_ID = None
+    # Typing while archive results are shown refines the archive search
+    if config.ACTIVE_FEED_URL and config.ACTIVE_FEED_URL.startswith(archive.SEARCH_PREFIX):
+        if get_search_term():
+            search_archive(config.ACTIVE_FEED_CONTAINER)
+        else:
+            config.ACTIVE_FEED_URL = None
+            show_initial_feed(config.ACTIVE_FEED_CONTAINER)
+        return
+    if config.ACTIVE_FEED_URL and config.ACTIVE_FEED_CONTAINER and config.ACTIVE_FEED_CONTAINER.winfo_exists():
+        display_page(
+            config.ACTIVE_FEED_CONTAINER,
+            get_category_name(config.ACTIVE_FEED_URL),
+            config.ACTIVE_FEED_URL,
+            1
+        )
+
+def search_archive(scrollable_frame):
+    """Show the whole history archive's best matches for the search box text."""
+    import archive
+    term = get_search_term()
+    if term:
+        show_read_only(scrollable_frame, f"{archive.SEARCH_PREFIX}{term}", archive.SearchResults(term), term)
+
 def highlight_text(text_widget, term):
+    """Highlight every occurrence of term (or of each term in a list)."""
     if not term:
         return
+    terms = [term] if isinstance(term, str) else term
 
     highlight_color = themes.THEMES.get(config.CURRENT_THEME, {}).get("search_bg", "#FFA726")
 
     text_widget.config(state="normal")
     text_widget.tag_remove("highlight", "1.0", "end")
 
-    term_lower = term.lower()
     content = text_widget.get("1.0", "end-1c").lower()
 
-    start = 0
-    while True:
-        start = content.find(term_lower, start)
-        if start == -1:
-            break
-        end = start + len(term)
-        text_widget.tag_add("highlight", f"1.0+{start}c", f"1.0+{end}c")
-        start = end
+    for term in terms:
+        term_lower = term.lower()
+        start = 0
+        while True:
+            start = content.find(term_lower, start)
+            if start == -1:
+                break
+            end = start + len(term)
+            text_widget.tag_add("highlight", f"1.0+{start}c", f"1.0+{end}c")
+            start = end
 
     text_widget.tag_config("highlight", background=highlight_color)
     text_widget.config(state="disabled")
 
-def display_page(container, category_name, feed_url, page_number):
-    theme = themes.THEMES[config.CURRENT_THEME]
-    config.CURRENT_PAGE = page_number
+def _dialogs():
+    """The dialogs module, imported on first use to keep it off the startup path."""
+    import dialogs
+    return dialogs
+
+def open_link(link):
+    if link and link != "#":
+        import webbrowser
+        webbrowser.open_new(link)
+
+def _create_article_row(container, theme):
+    """Create one reusable article row (hidden until filled by _fill_article_row)."""
+    row = {"link": "#", "visible": False, "source_shown": False}
+
+    row["frame"] = tk.Frame(container, bg=theme["frame_bg"])
+
+    row["headline"] = tk.Text(
+        row["frame"],
+        wrap="word",
+        height=2,
+        bg=theme["frame_bg"],
+        fg=theme["headline_fg"],
+        font=("Arial", 10, "bold"),
+        bd=0,
+        highlightthickness=0
+    )
+    row["headline"].config(state="disabled", cursor="hand2")
+    row["headline"].pack(side="left", fill="x", expand=True)
+    row["headline"].bind("<Button-1>", lambda e: open_link(row["link"]))
+
+    row["source"] = tk.Label(
+        row["frame"],
+        font=("Arial", 8, "italic"),
+        fg=theme["summary_fg"],
+        bg=theme["frame_bg"],
+        anchor="e"
+    )
 
-    for w in container.winfo_children():
-        w.destroy()
+    row["summary"] = tk.Text(
+        container,
+        wrap="word",
+        height=3,
+        bg=theme["frame_bg"],
+        fg=theme["summary_fg"],
+        font=("Arial", 9, "italic"),
+        bd=0,
+        highlightthickness=0
+    )
+    row["summary"].config(state="disabled")
 
-    entries = config.ALL_ARTICLES.get(feed_url, [])
-    total_articles = len(entries)
-    total_pages = (total_articles + config.ARTICLES_PER_PAGE - 1) // config.ARTICLES_PER_PAGE
-    total_pages = max(1, total_pages) if total_articles > 0 else 0
-
-    if total_pages > 0:
-        if page_number < 1:
-            page_number = 1
-        if page_number > total_pages:
-            page_number = total_pages
-    else:
-        page_number = 1
+    row["separator"] = tk.Frame(container, height=1, bg=theme["separator_bg"])
 
-    config.CURRENT_PAGE = page_number
-    start_index = (page_number - 1) * config.ARTICLES_PER_PAGE
-    end_index = start_index + config.ARTICLES_PER_PAGE
-    entries_to_display = entries[start_index:end_index]
+    for widget in (row["frame"], row["summary"], row["separator"]):
+        themes.apply_theme_to_widget(widget, config.CURRENT_THEME)
+    return row
 
-    url_count = len(rss.parse_feed_urls(feed_url))
-    is_amalgamated = url_count > 1
+def _set_text(text_widget, content):
+    text_widget.config(state="normal")
+    text_widget.delete("1.0", "end")
+    text_widget.insert("1.0", content)
+    text_widget.config(state="disabled")
 
-    page_text = f" (Page {page_number} of {total_pages})" if total_pages > 1 else ""
-    header_label = tk.Label(
+def _fill_article_row(row, entry, is_amalgamated, search_word, before):
+    """Swap an entry's content into a pooled row and make sure it is shown."""
+    source_domain = entry.source_domain
+
+    row["link"] = entry.link
+    _set_text(row["headline"], entry.title)
+    _set_text(row["summary"], entry.summary)
+
+    show_source = bool(is_amalgamated and source_domain)
+    if show_source:
+        row["source"].config(text=f"[{source_domain}]")
+    if show_source != row["source_shown"]:
+        if show_source:
+            row["source"].pack(side="right", padx=(5, 0))
+        else:
+            row["source"].pack_forget()
+        row["source_shown"] = show_source
+
+    highlight_text(row["headline"], search_word)
+    highlight_text(row["summary"], search_word)
+
+    if not row["visible"]:
+        row["frame"].pack(anchor="w", padx=15, pady=(5, 0), fill="x", before=before)
+        row["summary"].pack(anchor="w", padx=15, pady=(0, 2), fill="x", before=before)
+        row["separator"].pack(fill="x", padx=10, pady=2, before=before)
+        row["visible"] = True
+
+def _hide_article_row(row):
+    if row["visible"]:
+        row["frame"].pack_forget()
+        row["summary"].pack_forget()
+        row["separator"].pack_forget()
+        row["visible"] = False
+
+def _get_article_view(container):
+    """
+    Return the recycled widget set of the article container, building it if
+    the container was cleared (e.g. by the "Fetching news..." placeholder).
+    """
+    view = getattr(container, "_article_view", None)
+    if view and view["header"].winfo_exists():
+        return view
+
+    theme = themes.THEMES[config.CURRENT_THEME]
+    for w in container.winfo_children():
+        w.destroy()
+
+    view = {"rows": [], "page_buttons": [], "empty_shown": False, "nav_shown": False}
+
+    view["header"] = tk.Label(
         container,
-        text=f"--- Latest {category_name} Headlines{page_text} ---",
         font=("Arial", 12, "bold"),
         fg=theme["category_fg"],
         bg=theme["frame_bg"]
     )
-    header_label.pack(pady=(10, 5), padx=10, fill="x")
-
-    if not entries_to_display and total_articles == 0:
-        error_label = tk.Label(container, text="No news entries found for this feed.", fg=theme["error_fg"], bg=theme["frame_bg"])
-        error_label.pack(pady=10)
-
-    for entry in entries_to_display:
-        headline = entry.get("title", "No Title")
-        link = entry.get("link", "#")
-        summary_text = entry.get("summary", entry.get("description", ""))
-        summary = (summary_text.split(".")[0] + "...") if summary_text else ""
-        source_domain = getattr(entry, '_source_domain', None)
-
-        headline_frame = tk.Frame(container, bg=theme["frame_bg"])
-        headline_frame.pack(anchor="w", padx=15, pady=(5, 0), fill="x")
-
-        hl = tk.Text(
-            headline_frame,
-            wrap="word",
-            height=2,
-            bg=theme["frame_bg"],
-            fg=theme["headline_fg"],
-            font=("Arial", 10, "bold"),
-            bd=0,
-            highlightthickness=0
-        )
-        hl.insert("1.0", headline)
-        hl.config(state="disabled", cursor="hand2")
-        hl.pack(side="left", fill="x", expand=True)
-        hl.bind("<Button-1>", lambda e, l=link: webbrowser.open_new(l))
-
-        if is_amalgamated and source_domain:
-            source_label = tk.Label(
-                headline_frame,
-                text=f"[{source_domain}]",
-                font=("Arial", 8, "italic"),
-                fg=theme["summary_fg"],
-                bg=theme["frame_bg"],
-                anchor="e"
-            )
-            source_label.pack(side="right", padx=(5, 0))
-
-        sl = tk.Text(
-            container,
-            wrap="word",
-            height=3,
-            bg=theme["frame_bg"],
-            fg=theme["summary_fg"],
-            font=("Arial", 9, "italic"),
-            bd=0,
-            highlightthickness=0
-        )
-        sl.insert("1.0", summary)
-        sl.config(state="disabled")
-        sl.pack(anchor="w", padx=15, pady=(0, 2), fill="x")
+    view["header"].pack(pady=(10, 5), padx=10, fill="x")
+
+    view["empty"] = tk.Label(container, fg=theme["error_fg"], bg=theme["frame_bg"])
+
+    # Always packed (empty when there is a single page) so rows can be packed before it
+    view["footer"] = tk.Frame(container, bg=theme["frame_bg"])
+    view["footer"].pack(fill="x", padx=10)
+
+    view["nav"] = tk.Frame(view["footer"], bg=theme["frame_bg"], pady=10)
+    view["prev"] = tk.Button(view["nav"], text="← Previous")
+    view["prev"].pack(side="left", padx=10)
+    view["next"] = tk.Button(view["nav"], text="Next →")
+    view["next"].pack(side="right", padx=10)
+    for _ in range(config.MAX_PAGE_BUTTONS):
+        view["page_buttons"].append({"button": ttk.Button(view["nav"], style="TButton"), "visible": False})
 
-        search_word = config.SEARCH_TERM.get().strip()
-        highlight_text(hl, search_word)
-        highlight_text(sl, search_word)
+    themes.apply_theme_to_widget(container, config.CURRENT_THEME)
+    container._article_view = view
+    return view
 
-        tk.Frame(container, height=1, bg=theme["separator_bg"]).pack(fill="x", padx=10, pady=2)
+def display_page(container, category_name, feed_url, page_number):
+    with perf.span("display_page"):
+        _display_page(container, category_name, feed_url, page_number)
+    perf.startup_mark("first articles")
+
+def _display_page(container, category_name, feed_url, page_number):
+    import archive
+    import engine
+    import rss
+    theme = themes.THEMES[config.CURRENT_THEME]
+    config.CURRENT_PAGE = page_number
 
-    if total_pages > 1:
-        nav = tk.Frame(container, bg=theme["frame_bg"], pady=10)
-        nav.pack(fill="x", padx=10)
+    view = _get_article_view(container)
 
-        state_prev = "normal" if page_number > 1 else "disabled"
-        tk.Button(nav, text="← Previous", state=state_prev, command=lambda: display_page(container, category_name, feed_url, page_number - 1)).pack(side="left", padx=10)
+    # An active search filters across every cached feed instead of one feed,
+    # except on archive results, which are already the matches of that search
+    search_word = get_search_term()
+    archive_search = feed_url.startswith(archive.SEARCH_PREFIX)
+    entries = engine.ENGINE.entries(feed_url, None if archive_search else search_word)
+    total_articles = len(entries)
+    try:
+        entries_to_display, page_number, total_pages = engine.ENGINE.paginate(entries, page_number)
+    except Exception as e:
+        # Snapshot entries are decoded lazily, so a corrupt one only shows up here
+        import snapshot
+        if not isinstance(e, snapshot.SnapshotFormatError):
+            raise
+        messagebox.showerror("Error", f"Could not open the snapshot:\n{e}", parent=config.ROOT)
+        return
+    config.CURRENT_PAGE = page_number
 
-        MAX_BUTTONS = 5
-        start_page = max(1, page_number - (MAX_BUTTONS // 2))
-        end_page = min(total_pages, start_page + MAX_BUTTONS - 1)
-        if end_page - start_page < MAX_BUTTONS - 1:
-            start_page = max(1, total_pages - MAX_BUTTONS + 1)
+    url_count = len(rss.parse_feed_urls(feed_url))
+    is_amalgamated = url_count > 1 or bool(search_word) or feed_url in _READ_ONLY_VIEWS
 
-        for i in range(start_page, end_page + 1):
-            ttk.Button(nav, text=str(i), command=lambda p=i: display_page(container, category_name, feed_url, p), style="TButton").pack(side="left", padx=2)
+    page_text = f" (Page {page_number} of {total_pages})" if total_pages > 1 else ""
+    if archive_search:
+        view["header"].config(text=f"--- Best matches in history for '{category_name}' ({total_articles}){page_text} ---")
+    elif search_word:
+        view["header"].config(text=f"--- Search results for '{search_word}' ({total_articles}){page_text} ---")
+    else:
+        view["header"].config(text=f"--- Latest {category_name} Headlines{page_text} ---")
+
+    show_empty = not entries_to_display and total_articles == 0
+    if show_empty:
+        view["empty"].config(text="No articles match your search." if search_word else "No news entries found for this feed.")
+    if show_empty != view["empty_shown"]:
+        if show_empty:
+            view["empty"].pack(pady=10, before=view["footer"])
+        else:
+            view["empty"].pack_forget()
+        view["empty_shown"] = show_empty
+
+    # Grow the row pool if needed, then swap contents into the existing rows
+    while len(view["rows"]) < len(entries_to_display):
+        view["rows"].append(_create_article_row(container, theme))
+
+    for row, entry in zip(view["rows"], entries_to_display):
+        _fill_article_row(row, entry, is_amalgamated, entries.terms if archive_search else search_word, view["footer"])
+    for row in view["rows"][len(entries_to_display):]:
+        _hide_article_row(row)
+
+    show_nav = total_pages > 1
+    if show_nav != view["nav_shown"]:
+        if show_nav:
+            view["nav"].pack(fill="x")
+        else:
+            view["nav"].pack_forget()
+        view["nav_shown"] = show_nav
+
+    if show_nav:
+        view["prev"].config(
+            state="normal" if page_number > 1 else "disabled",
+            command=lambda: display_page(container, category_name, feed_url, page_number - 1)
+        )
+        view["next"].config(
+            state="normal" if page_number < total_pages else "disabled",
+            command=lambda: display_page(container, category_name, feed_url, page_number + 1)
+        )
 
-        state_next = "normal" if page_number < total_pages else "disabled"
-        tk.Button(nav, text="Next →", state=state_next, command=lambda: display_page(container, category_name, feed_url, page_number + 1)).pack(side="right", padx=10)
+        start_page = max(1, page_number - (config.MAX_PAGE_BUTTONS // 2))
+        end_page = min(total_pages, start_page + config.MAX_PAGE_BUTTONS - 1)
+        if end_page - start_page < config.MAX_PAGE_BUTTONS - 1:
+            start_page = max(1, total_pages - config.MAX_PAGE_BUTTONS + 1)
+
+        pages = list(range(start_page, end_page + 1))
+        for slot, page_button in enumerate(view["page_buttons"]):
+            if slot < len(pages):
+                p = pages[slot]
+                page_button["button"].config(text=str(p), command=lambda p=p: display_page(container, category_name, feed_url, p))
+                if not page_button["visible"]:
+                    page_button["button"].pack(side="left", padx=2, before=view["next"])
+                    page_button["visible"] = True
+            elif page_button["visible"]:
+                page_button["button"].pack_forget()
+                page_button["visible"] = False
 
     if config.ROOT:
         config.ROOT.after(50, lambda: container.master.configure(scrollregion=container.master.bbox("all")))
-    themes.apply_theme_to_widget(container, config.CURRENT_THEME)
+
+def schedule_prefetch():
+    """Warm the article cache for every other feed in the active list."""
+    import engine
+    prefetch.schedule(
+        config.CURRENT_FEEDS,
+        config.ACTIVE_FEED_URL,
+        engine.ENGINE.fetch,
+        engine.ENGINE.ingest,
+        engine.ENGINE.is_fresh
+    )
 
 def fetch_and_display_news(feed_url, container, category_name):
+    import engine
     theme = themes.THEMES[config.CURRENT_THEME]
     config.ACTIVE_FEED_URL = feed_url
     config.ACTIVE_FEED_CONTAINER = container
 
-    for w in container.winfo_children():
-        w.destroy()
-
-    tk.Label(container, text="Fetching news...", font=("Arial", 12, "italic"), fg=theme["summary_fg"], bg=theme["frame_bg"]).pack(pady=50)
-
-    try:
-        entries = rss.fetch_feed_entries(feed_url, max_entries=100)
-        config.ALL_ARTICLES[feed_url] = entries
+    # Show the last known headlines straight away and reconcile in the background
+    cached = engine.ENGINE.load_cached(feed_url)
+    if cached:
         config.CURRENT_PAGE = 1
         display_page(container, category_name, feed_url, config.CURRENT_PAGE)
-    except Exception as e:
+    else:
+        for w in container.winfo_children():
+            w.destroy()
+
+        tk.Label(container, text="Fetching news...", font=("Arial", 12, "italic"), fg=theme["summary_fg"], bg=theme["frame_bg"]).pack(pady=50)
+
+    # Prefetched recently: the in-memory page is current, skip the network
+    if cached and engine.ENGINE.is_fresh(feed_url):
+        tasks.cancel("display")
+        schedule_prefetch()
+        return
+
+    # Failed recently: wait out the backoff instead of requesting it on every click
+    if scheduler.is_backing_off(feed_url):
+        tasks.cancel("display")
+        if not cached:
+            for w in container.winfo_children():
+                w.destroy()
+            tk.Label(
+                container,
+                text="This feed could not be fetched recently and will be retried later.\nPress Refresh to try now.",
+                font=("Arial", 12, "italic"), fg=theme["summary_fg"], bg=theme["frame_bg"]
+            ).pack(pady=50)
+        schedule_prefetch()
+        return
+
+    def on_success(entries):
+        changed = engine.ENGINE.ingest(feed_url, entries)
+        if not cached:
+            config.CURRENT_PAGE = 1
+        # Update in place: keep the reader's page and scroll position
+        if changed or not cached:
+            display_page(container, category_name, feed_url, config.CURRENT_PAGE)
+
+    def on_error(e):
+        # Cached headlines stay on screen if the network is unavailable
+        if cached:
+            return
         for w in container.winfo_children():
             w.destroy()
         messagebox.showerror("Fetching Error", f"Error fetching RSS:\n{e}")
-    finally:
-        time.sleep(0.05)
+
+    # The "display" slot supersedes any fetch still running for another category
+    tasks.submit(
+        lambda cancel_event: engine.ENGINE.fetch(feed_url, cancel_event),
+        on_success=on_success,
+        on_error=on_error,
+        slot="display"
+    )
+    schedule_prefetch()
+
+def get_category_name(feed_url):
+    if feed_url in _READ_ONLY_VIEWS:
+        return _READ_ONLY_VIEWS[feed_url]
+    for feed_data in config.CURRENT_FEEDS:
+        name, url = feed_data[0], feed_data[1]
+        if url == feed_url:
+            return name
+    return "Feed"
+
+def refresh_feed(feed_url, on_success=None, on_error=None):
+    """Refetch one feed in the background and redraw it if it is on screen."""
+    import engine
+    container = config.ACTIVE_FEED_CONTAINER
+
+    def on_fetched(entries):
+        changed = engine.ENGINE.ingest(feed_url, entries)
+        # Only redraw if something changed and the user is still looking at the feed
+        if changed and config.ACTIVE_FEED_URL == feed_url and container and container.winfo_exists():
+            display_page(container, get_category_name(feed_url), feed_url, config.CURRENT_PAGE)
+        if on_success:
+            on_success(entries)
+
+    tasks.submit(
+        lambda cancel_event: engine.ENGINE.fetch(feed_url, cancel_event),
+        on_success=on_fetched,
+        on_error=on_error,
+        slot=f"refresh:{feed_url}"
+    )
 
 def periodic_refresh(manual=False):
-    if config.ACTIVE_FEED_URL and config.ACTIVE_FEED_CONTAINER and config.ACTIVE_FEED_CONTAINER.winfo_exists():
-        category_name = "Feed"
-        for feed_data in config.CURRENT_FEEDS:
-            name, url = feed_data[0], feed_data[1]
-            if url == config.ACTIVE_FEED_URL:
-                category_name = name
-                break
-        try:
-            entries = rss.fetch_feed_entries(config.ACTIVE_FEED_URL, max_entries=100)
-            config.ALL_ARTICLES[config.ACTIVE_FEED_URL] = entries
-            display_page(config.ACTIVE_FEED_CONTAINER, category_name, config.ACTIVE_FEED_URL, config.CURRENT_PAGE)
-            if manual:
-                messagebox.showinfo("Refreshed", f"'{category_name}' refreshed.")
-        except Exception as e:
-            if manual:
-                messagebox.showerror("Error", f"Refresh failed:\n{e}")
-    elif manual:
-        messagebox.showinfo("Refresh", "No active feed to refresh.")
-
-    if not manual and config.ROOT:
-        config.ROOT.after(config.REFRESH_INTERVAL_MS, periodic_refresh)
-
-def update_category_buttons(button_frame, scrollable_frame):
+    """
+    Refresh feeds. A manual refresh refetches the active feed right away;
+    otherwise every feed in the list whose adaptive interval has elapsed is
+    refetched and the check is rescheduled.
+    """
+    if manual:
+        if config.ACTIVE_FEED_URL in _READ_ONLY_VIEWS:
+            messagebox.showinfo("Refresh", "Snapshots and history are read-only and cannot be refreshed.")
+        elif config.ACTIVE_FEED_URL and config.ACTIVE_FEED_CONTAINER and config.ACTIVE_FEED_CONTAINER.winfo_exists():
+            category_name = get_category_name(config.ACTIVE_FEED_URL)
+            refresh_feed(
+                config.ACTIVE_FEED_URL,
+                on_success=lambda entries: messagebox.showinfo("Refreshed", f"'{category_name}' refreshed."),
+                on_error=lambda e: messagebox.showerror("Error", f"Refresh failed:\n{e}")
+            )
+        else:
+            messagebox.showinfo("Refresh", "No active feed to refresh.")
+        return
+
+    feed_urls = [url for name, url, row in config.CURRENT_FEEDS]
+    for feed_url in scheduler.due_feeds(feed_urls):
+        if tasks.is_busy(f"refresh:{feed_url}") or (feed_url == config.ACTIVE_FEED_URL and tasks.is_busy("display")):
+            continue
+        scheduler.postpone(feed_url)
+        refresh_feed(feed_url)
+
+    if config.ROOT:
+        config.ROOT.after(config.REFRESH_CHECK_INTERVAL_MS, periodic_refresh)
+
+def show_initial_feed(scrollable_frame):
+    """Display the first feed of the list unless one is already active."""
+    if config.ACTIVE_FEED_URL is None and config.CURRENT_FEEDS:
+        initial_name, initial_url, _ = config.CURRENT_FEEDS[0]
+        fetch_and_display_news(initial_url, scrollable_frame, initial_name)
+    else:
+        schedule_prefetch()
+
+def update_category_buttons(button_frame, scrollable_frame, show_initial=True):
     theme = themes.THEMES[config.CURRENT_THEME]
     for w in button_frame.winfo_children():
         w.destroy()
@@ -252,7 +516,7 @@ def update_category_buttons(button_frame, scrollable_frame):
                     command=lambda u=url, n=name: fetch_and_display_news(u, scrollable_frame, n)
                 ).pack(side="left", padx=3, pady=5)
 
-    ttk.Button(button_frame, text="Manage Feeds", command=lambda: dialogs.feed_manager_window(button_frame, scrollable_frame)).pack(side="right", padx=5, fill="y")
+    ttk.Button(button_frame, text="Manage Feeds", command=lambda: _dialogs().feed_manager_window(button_frame, scrollable_frame)).pack(side="right", padx=5, fill="y")
 
     if not config.CURRENT_FEEDS:
         tk.Label(main_container, text="List is empty. Add feeds via 'Manage Feeds'.", fg=theme["error_fg"], bg=theme["frame_bg"]).pack(side="left", padx=10)
@@ -262,9 +526,8 @@ def update_category_buttons(button_frame, scrollable_frame):
     if config.ACTIVE_FEED_URL not in feed_urls:
         config.ACTIVE_FEED_URL = None
 
-    if config.ACTIVE_FEED_URL is None and config.CURRENT_FEEDS:
-        initial_name, initial_url, _ = config.CURRENT_FEEDS[0]
-        fetch_and_display_news(initial_url, scrollable_frame, initial_name)
+    if show_initial:
+        show_initial_feed(scrollable_frame)
 
 def location_manager_window():
     if config.LOCATION_MANAGER_WINDOW and config.LOCATION_MANAGER_WINDOW.winfo_exists():
@@ -317,6 +580,135 @@ def location_manager_window():
     themes.apply_theme_to_widget(manager_root, config.CURRENT_THEME)
     manager_root.protocol("WM_DELETE_WINDOW", on_close)
 
+def performance_window():
+    """Help → Performance: rolling timings of the instrumented spans."""
+    if config.PERFORMANCE_WINDOW and config.PERFORMANCE_WINDOW.winfo_exists():
+        config.PERFORMANCE_WINDOW.lift()
+        return
+
+    theme = themes.THEMES[config.CURRENT_THEME]
+    perf_root = tk.Toplevel(config.ROOT)
+    config.PERFORMANCE_WINDOW = perf_root
+    perf_root.title("Performance")
+    perf_root.geometry("640x360")
+    perf_root.configure(bg=theme["bg"])
+    perf_root.transient(config.ROOT)
+
+    frame = tk.Frame(perf_root, bg=theme["frame_bg"], padx=15, pady=15)
+    frame.pack(fill="both", expand=True)
+
+    columns = ("count", "p50", "p90", "p99", "max", "total")
+    table = ttk.Treeview(frame, columns=columns, height=10)
+    table.heading("#0", text="Span")
+    table.column("#0", width=140)
+    for column in columns:
+        table.heading(column, text=column if column == "count" else f"{column} ms")
+        table.column(column, width=75, anchor="e")
+    table.pack(fill="both", expand=True)
+
+    controls = tk.Frame(frame, bg=theme["frame_bg"])
+    controls.pack(fill="x", pady=(10, 0))
+
+    enabled = tk.BooleanVar(value=config.PERF_ENABLED)
+    tracing = tk.BooleanVar(value=perf.is_tracing())
+
+    def toggle_enabled():
+        config.PERF_ENABLED = enabled.get()
+
+    def toggle_trace():
+        if tracing.get():
+            perf.start_trace()
+        else:
+            perf.stop_trace()
+
+    tk.Checkbutton(controls, text="Record timings", variable=enabled, command=toggle_enabled).pack(side="left")
+    tk.Checkbutton(controls, text=f"Write trace to {config.PERF_TRACE_FILE}", variable=tracing, command=toggle_trace).pack(side="left", padx=10)
+    ttk.Button(controls, text="Reset", command=perf.reset).pack(side="right")
+
+    def refresh_table():
+        if not perf_root.winfo_exists():
+            return
+        table.delete(*table.get_children())
+        for name, count, *timings in perf.summary():
+            table.insert("", "end", text=name, values=(count, *(f"{value:.1f}" for value in timings)))
+        perf_root.after(1000, refresh_table)
+
+    def on_close():
+        config.PERFORMANCE_WINDOW = None
+        perf_root.destroy()
+
+    refresh_table()
+    themes.apply_theme_to_widget(perf_root, config.CURRENT_THEME)
+    perf_root.protocol("WM_DELETE_WINDOW", on_close)
+
+def export_snapshot():
+    """Write the cached articles of the active list to a snapshot file."""
+    import engine
+    import rss
+    import snapshot
+    path = filedialog.asksaveasfilename(
+        title="Export Snapshot",
+        defaultextension=".nfsnap",
+        filetypes=[("News snapshots", "*.nfsnap"), ("All files", "*.*")],
+        initialfile=f"{config.ACTIVE_LIST_NAME}.nfsnap",
+        parent=config.ROOT
+    )
+    if not path:
+        return
+
+    feeds = [engine.ENGINE.entries(url) for name, url, row in config.CURRENT_FEEDS]
+    entries = rss.merge_sources(feeds, sum(len(entries) for entries in feeds))
+    try:
+        count = snapshot.export(path, entries)
+    except OSError as e:
+        messagebox.showerror("Error", f"Could not write the snapshot:\n{e}", parent=config.ROOT)
+        return
+    messagebox.showinfo("Exported", f"Exported {count} articles from '{config.ACTIVE_LIST_NAME}'.", parent=config.ROOT)
+
+def import_snapshot(scrollable_frame):
+    """Open a snapshot file and page through it in the article view."""
+    import snapshot
+    path = filedialog.askopenfilename(
+        title="Import Snapshot",
+        filetypes=[("News snapshots", "*.nfsnap"), ("All files", "*.*")],
+        parent=config.ROOT
+    )
+    if not path:
+        return
+
+    try:
+        entries = snapshot.Snapshot(path)
+    except (OSError, snapshot.SnapshotFormatError) as e:
+        messagebox.showerror("Error", f"Could not open the snapshot:\n{e}", parent=config.ROOT)
+        return
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    show_read_only(scrollable_frame, snapshot.URL_PREFIX + path, entries, name)
+
+def show_history(scrollable_frame, source_urls, start, end, name):
+    """Page through archived articles of source_urls published in [start, end)."""
+    import archive
+    entries = archive.History(source_urls, start, end)
+    show_read_only(scrollable_frame, f"{archive.URL_PREFIX}{name}", entries, name)
+
+def show_read_only(scrollable_frame, feed_url, entries, name):
+    """
+    Display a lazily loaded entry sequence in the article view. Only one
+    read-only view is attached to the engine at a time.
+    """
+    import engine
+    # Nothing may still be reading the old view once remove_feed closes it
+    tasks.cancel("display")
+    for view_url in _READ_ONLY_VIEWS:
+        engine.ENGINE.remove_feed(view_url)
+    _READ_ONLY_VIEWS.clear()
+    _READ_ONLY_VIEWS[feed_url] = name
+
+    engine.ENGINE.attach(feed_url, entries)
+    config.ACTIVE_FEED_URL = feed_url
+    config.ACTIVE_FEED_CONTAINER = scrollable_frame
+    display_page(scrollable_frame, name, feed_url, 1)
+
 def set_default_list():
     config.DEFAULT_LIST_NAME = config.ACTIVE_LIST_NAME
     config.save_config()
@@ -329,8 +721,12 @@ def on_exit():
 
     if mem_state_lists != saved_state_lists:
         if messagebox.askyesno("Unsaved Changes", f"Save changes to list '{config.ACTIVE_LIST_NAME}' before exiting?"):
-            dialogs.save_current_list()
+            _dialogs().save_current_list()
 
+    config.flush_config()
+    import http_pool
+    http_pool.close_all()
+    perf.stop_trace()
     config.ROOT.destroy()
 
 def setup_gui():
@@ -359,14 +755,10 @@ def setup_gui():
     config.SEARCH_TERM = tk.StringVar()
     search_entry = ttk.Entry(header_frame, textvariable=config.SEARCH_TERM, width=30)
     search_entry.pack(side="right", padx=(10, 5))
-    search_entry.insert(0, "Search...")
-    search_entry.bind("<FocusIn>", lambda e: search_entry.delete(0, "end") if search_entry.get() == "Search..." else None)
-    search_entry.bind("<KeyRelease>", lambda e: display_page(
-        config.ACTIVE_FEED_CONTAINER,
-        "Feed",
-        config.ACTIVE_FEED_URL,
-        config.CURRENT_PAGE
-    ) if config.ACTIVE_FEED_URL else None)
+    search_entry.insert(0, SEARCH_PLACEHOLDER)
+    search_entry.bind("<FocusIn>", lambda e: search_entry.delete(0, "end") if search_entry.get() == SEARCH_PLACEHOLDER else None)
+    search_entry.bind("<KeyRelease>", lambda e: schedule_search() if e.keysym != "Return" else None)
+    search_entry.bind("<Return>", lambda e: search_archive(scrollable_frame))
     
     utils.update_weather_display()
 
@@ -375,14 +767,18 @@ def setup_gui():
 
     file_menu = tk.Menu(menubar, tearoff=0, bg=theme["menu_bg"], fg=theme["menu_fg"], activebackground=theme["menu_active_bg"], activeforeground=theme["menu_fg"])
     menubar.add_cascade(label="File", menu=file_menu)
-    file_menu.add_command(label="New List", command=lambda: dialogs.new_list_dialog(button_frame, scrollable_frame))
-    file_menu.add_command(label="Open List", command=lambda: dialogs.open_list_dialog(button_frame, scrollable_frame))
+    file_menu.add_command(label="New List", command=lambda: _dialogs().new_list_dialog(button_frame, scrollable_frame))
+    file_menu.add_command(label="Open List", command=lambda: _dialogs().open_list_dialog(button_frame, scrollable_frame))
     file_menu.add_separator()
-    file_menu.add_command(label="Save", command=dialogs.save_current_list)
-    file_menu.add_command(label="Save As", command=dialogs.save_current_list_as)
+    file_menu.add_command(label="Save", command=lambda: _dialogs().save_current_list())
+    file_menu.add_command(label="Save As", command=lambda: _dialogs().save_current_list_as())
     file_menu.add_separator()
     file_menu.add_command(label="Set as Default", command=set_default_list)
-    file_menu.add_command(label="Delete List", command=dialogs.delete_list_dialog)
+    file_menu.add_command(label="Delete List", command=lambda: _dialogs().delete_list_dialog())
+    file_menu.add_separator()
+    file_menu.add_command(label="Export Snapshot...", command=export_snapshot)
+    file_menu.add_command(label="Import Snapshot...", command=lambda: import_snapshot(scrollable_frame))
+    file_menu.add_command(label="Browse History...", command=lambda: _dialogs().history_dialog(scrollable_frame))
     file_menu.add_separator()
     file_menu.add_command(label="Exit", command=on_exit)
 
@@ -413,7 +809,9 @@ def setup_gui():
             "This is your personal News Feed app.\n\n"
             "• Select a feed from the top rows.\n"
             "• Headlines and summaries appear below.\n"
-            "• Use the Search box (top-right) to highlight words.\n"
+            "• Use the Search box (top-right) to find words across all loaded feeds.\n"
+            "• Press Enter in the Search box to search all past articles, best matches first\n"
+            "  (\"quotes\" for phrases, word* for prefixes).\n"
             "• Use File → Manage Lists to customize feeds.\n"
             "• Use Location menu to change weather city.\n"
             "• Use Style to toggle dark/light mode.\n\n"
@@ -421,6 +819,7 @@ def setup_gui():
         )
 
     help_menu.add_command(label="Info", command=show_info)
+    help_menu.add_command(label="Performance", command=performance_window)
 
     button_frame = tk.Frame(config.ROOT, bg=theme["frame_bg"])
     button_frame.pack(fill="x", padx=10, pady=(5, 5))
@@ -439,8 +838,22 @@ def setup_gui():
     scrollbar.pack(side="right", fill="y")
     enable_mouse_wheel(canvas)
 
-    update_category_buttons(button_frame, scrollable_frame)
-    periodic_refresh()
+    tasks.start_polling()
+    update_category_buttons(button_frame, scrollable_frame, show_initial=False)
     themes.apply_theme(config.ROOT, config.CURRENT_THEME)
 
+    def start_feeds():
+        # Paint the window first; the article store and the network come after
+        config.ROOT.update_idletasks()
+        perf.startup_mark("first paint")
+        show_initial_feed(scrollable_frame)
+        periodic_refresh()
+
+    def on_map(event):
+        if event.widget is config.ROOT:
+            config.ROOT.unbind("<Map>")
+            config.ROOT.after(0, start_feeds)
+
+    config.ROOT.bind("<Map>", on_map)
+    perf.startup_mark("window built")
     config.ROOT.mainloop()
\ No newline at end of file